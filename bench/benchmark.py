@@ -0,0 +1,103 @@
+"""
+Time each PBVI phase (expand, improve, backup, argmax) on standard domains of growing size
+and write one JSON record per round, for tracking performance regressions.
+
+    python benchmark.py --domains tiger hallway tag rockSample --rounds 4 --output ../bench_output.txt
+    python benchmark.py --domains --files hallway.pomdp tag.pomdp
+"""
+
+import sys
+sys.path.append('../src/')
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+import numpy as np
+import domains
+from alphaSet import AlphaSet
+from batchBeliefTransition import BatchBeliefTransition
+from expansion import BudgetedExpand
+from matrixBackup import MatrixBackup
+from PBVI import BatchImprove, IndexedExpand
+from pomdpFile import loadPOMDP
+from prune import Prune
+
+configurations={
+    'tiger': [{}],
+    'hallway': [{'length': 4}, {'length': 8}, {'length': 16}],
+    'tag': [{'width': 3, 'height': 3}, {'width': 4, 'height': 4}, {'width': 5, 'height': 5}],
+    'rockSample': [{'size': 4, 'rockNumber': 2}, {'size': 4, 'rockNumber': 4}, {'size': 5, 'rockNumber': 5}],
+}
+
+
+def timed(function, *args, **kwargs):
+    start=time.perf_counter()
+    result=function(*args, **kwargs)
+    return result, time.perf_counter()-start
+
+
+def runBenchmark(domain, parameters, rounds, gamma, budget, maxIterations, workerNumber, pruneStrength, backend):
+    tracemalloc.start()
+    if domain.endswith('.pomdp'):
+        (model, discount, b0), compileTime=timed(loadPOMDP, domain)
+        gamma=gamma if discount is None else discount
+    else:
+        model, compileTime=timed(getattr(domains, domain), **parameters)
+        b0=domains.initialBelief(model, domain)
+    backup=MatrixBackup(model, gamma, 10, workerNumber, backend=backend)
+    prune=None if pruneStrength == 'none' else Prune(pruneStrength)
+    improve=BatchImprove(backup, prune, maxIterations)
+    batchBeliefTransition=BatchBeliefTransition(model)
+    expand=IndexedExpand(batchBeliefTransition, backend=backend) if budget is None else BudgetedExpand(batchBeliefTransition, budget, backend=backend)
+    V=AlphaSet(model.stateSpace, model.actionSpace)
+    V.add(np.full(model.numberOfStates, model.rewardMatrix.min()/(1-gamma)), 0)
+    B=b0[None, :]
+    records=[]
+    for i in range(rounds):
+        V, improveTime=timed(improve, V, B)
+        _, backupTime=timed(backup, V, B)
+        _, argmaxTime=timed(V.argmax, B)
+        beliefNumber=len(B)
+        B, expandTime=timed(expand, B, V)
+        current, peak=tracemalloc.get_traced_memory()
+        records.append({'domain': domain, 'parameters': parameters, 'round': i,
+                        'numberOfStates': model.numberOfStates, 'numberOfActions': model.numberOfActions,
+                        'numberOfObservations': model.numberOfObservations, 'sparse': model.isSparse,
+                        'beliefNumber': beliefNumber, 'alphaNumber': len(V), 'prunedNumber': 0 if prune is None else prune.prunedNumber,
+                        'backend': backup.kernels.name, 'compileTime': compileTime,
+                        'improveTime': improveTime, 'backupTime': backupTime, 'argmaxTime': argmaxTime,
+                        'expandTime': expandTime, 'peakMemory': peak})
+    backup.close()
+    tracemalloc.stop()
+    return records
+
+
+def main():
+    parser=argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--domains', nargs='*', default=list(configurations), choices=list(configurations))
+    parser.add_argument('--files', nargs='*', default=[], help='.pomdp files to benchmark alongside the generated domains')
+    parser.add_argument('--rounds', type=int, default=4)
+    parser.add_argument('--gamma', type=float, default=0.95)
+    parser.add_argument('--budget', type=int, default=None, help='points added per expansion round (default: one per belief)')
+    parser.add_argument('--maxIterations', type=int, default=20, help='backup sweeps per improve phase')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--prune', default='belief', choices=['none', 'pointwise', 'belief', 'lp'])
+    parser.add_argument('--backend', default='numpy', choices=['numpy', 'numba', 'auto'], help='kernel backend for the point backups and belief searches')
+    parser.add_argument('--output', default=None, help='JSON lines file (default: stdout)')
+    arguments=parser.parse_args()
+    output=sys.stdout if arguments.output is None else open(arguments.output, 'a')
+    environment={'python': platform.python_version(), 'numpy': np.__version__, 'machine': platform.machine()}
+    runs=[(domain, parameters) for domain in arguments.domains for parameters in configurations[domain]]+[(path, {}) for path in arguments.files]
+    for domain, parameters in runs:
+        for record in runBenchmark(domain, parameters, arguments.rounds, arguments.gamma, arguments.budget, arguments.maxIterations, arguments.workers, arguments.prune, arguments.backend):
+            record.update(environment)
+            output.write(json.dumps(record)+'\n')
+            output.flush()
+    if output is not sys.stdout:
+        output.close()
+
+
+if __name__=="__main__":
+    main()
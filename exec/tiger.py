@@ -99,11 +99,14 @@ def main():
     
     getPolicy=GetPolicy(argmaxAlpha)
     
-    expansionNumber=3
+    expansionNumber=4
     pbvi=PBVI(improve, expand, getPolicy, V, expansionNumber)
     
+    b0={'tiger-left':0.5, 'tiger-right':0.5}
+    policy=pbvi.solve(b0)
+    
     B=[{'tiger-left':0.05*n, 'tiger-right':1-0.05*n} for n in range(21)]
-    a=[pbvi(b) for b in B]
+    a=policy.action(B)
     print(a)
     
 
@@ -1,48 +1,210 @@
+import itertools
 import numpy as np
+from alphaSet import AlphaSet
+from beliefSet import BeliefSet
+from kernels import getKernels
+from policy import Policy
 
 class PBVI(object):
     
-    def __init__(self, improve, expand, getPolicy, V, expansionNumber):
+    def __init__(self, improve, expand, getPolicy, V, expansionNumber, budget=None, tolerance=None, callback=None, recorder=None, upperBound=None, gapTolerance=None):
         self.improve=improve
         self.expand=expand
         self.getPolicy=getPolicy
         self.V=V
         self.expansionNumber=expansionNumber
+        self.budget=budget
+        self.tolerance=tolerance
+        self.callback=callback
+        self.recorder=recorder
+        self.upperBound=upperBound
+        self.gapTolerance=gapTolerance
         
     def __call__(self, b0):
-        B=[b0]
-        V=self.V
-        for i in range(self.expansionNumber):
-            V=self.improve(V, B)
-            B=self.expand(B)
-        a=self.getPolicy(V, b0)
+        policy=self.solve(b0)
+        a=self.getPolicy(policy.V, b0)
         return a
+
+    def solve(self, b0):
+        # a vector b0 keeps B a belief matrix, so the batched components never convert it back and forth
+        B=np.atleast_2d(b0) if isinstance(b0, np.ndarray) else [b0]
+        V=self.V
+        if self.budget is not None:
+            self.budget.start()
+        iterations=itertools.count() if self.expansionNumber is None else range(self.expansionNumber)
+        stopReason='expansionNumber'
+        improveNumber=0
+        gap=None
+        try:
+            for i in iterations:
+                if self.tolerance is not None:
+                    previousValue=Policy(V).value(B)
+                start=None if self.recorder is None else self.recorder.clock()
+                V=self.improve(V, B)
+                improveNumber+=1
+                if self.upperBound is not None:
+                    self.upperBound.update(B, self.budget)
+                    gap=float(self.upperBound.gap(V, B[:1])[0])
+                self.record('improve', i, start, V, B, gap)
+                if self.callback is not None and self.callback('improve', i, V, B):
+                    stopReason='callback'
+                    break
+                if self.tolerance is not None and np.abs(Policy(V).value(B)-previousValue).max() < self.tolerance:
+                    stopReason='tolerance'
+                    break
+                if self.gapTolerance is not None and gap is not None and gap < self.gapTolerance:
+                    stopReason='gap'
+                    break
+                if self.budget is not None and self.budget.exhausted():
+                    stopReason='budget'
+                    break
+                start=None if self.recorder is None else self.recorder.clock()
+                B=self.expand(B, V)
+                self.record('expand', i, start, V, B)
+                if self.callback is not None and self.callback('expand', i, V, B):
+                    stopReason='callback'
+                    break
+        except KeyboardInterrupt:
+            stopReason='interrupted'
+        metadata={'iterations': improveNumber, 'stopReason': stopReason}
+        if gap is not None:
+            metadata['gap']=gap
+        return Policy(V, B, metadata=metadata)
+
+    def record(self, phase, i, start, V, B, gap=None):
+        if self.recorder is not None:
+            self.recorder.addTime(phase+'Time', self.recorder.clock()-start)
+            fields={} if gap is None else {'gap': gap}
+            self.recorder.flush(phase, i, beliefNumber=len(B), alphaNumber=len(V), **fields)
+
+    def resolve(self, policy):
+        # the previous alpha vectors were computed for the old model and can overestimate the new one, which stalls
+        # Improve; shifting them below the new Bellman backups at the old beliefs makes Improve climb monotonically again
+        if policy.B is None:
+            raise ValueError('resolve needs the beliefs the policy was solved on, but policy.B is None')
+        if self.budget is not None:
+            self.budget.start()
+        start=None if self.recorder is None else self.recorder.clock()
+        V, shift=shiftToLowerBound(policy.V, self.improve.sweep(policy.V, policy.B), policy.B, self.improve.gamma)
+        V=self.improve(V, policy.B)
+        self.record('improve', 0, start, V, policy.B)
+        return Policy(V, policy.B, metadata={'iterations': 1, 'stopReason': 'resolve', 'shift': shift})
             
         
 class Improve(object):
     
-    def __init__(self, backup):
+    def __init__(self, backup, prune=None, maxIterations=None, budget=None, recorder=None, tolerance=0.0):
         self.backup=backup
+        self.prune=prune
+        self.maxIterations=maxIterations
+        self.budget=budget
+        self.recorder=recorder
+        self.tolerance=tolerance
+
+    @property
+    def gamma(self):
+        return self.backup.getBetaA.gamma
         
     def __call__(self, V, B):
-        newAlpha=V.copy()
-        while newAlpha != []:
-            alphaSet=[self.backup(V, b) for b in B]
-            newAlpha=[alpha for alpha in alphaSet if alpha not in V]
-            V=V.copy()+newAlpha
-            #print(newAlpha)
-            #V=alphaSet.copy()
+        # pruning after every sweep can drop a vector the next sweep regenerates, so convergence is judged by the
+        # value at B rather than by whether the sweep produced new vectors
+        value=Policy(V).value(B)
+        prunedNumber=0
+        iteration=0
+        while not stopImprove(iteration, self.maxIterations, self.budget):
+            alphaSet=self.sweep(V, B)
+            V=V.copy()+[alpha for alpha in alphaSet if alpha not in V]
+            if self.prune is not None:
+                V=self.prune(V, B)
+                prunedNumber+=self.prune.lastPrunedNumber
+            iteration+=1
+            value, previousValue=Policy(V).value(B), value
+            if np.max(value-previousValue) <= self.tolerance:
+                break
+        recordImprove(self.recorder, iteration, self.prune, prunedNumber)
         return V
+
+    def sweep(self, V, B):
+        return [self.backup(V, b) for b in B]
+
+
+class BatchImprove(object):
+
+    def __init__(self, batchBackup, prune=None, maxIterations=None, budget=None, recorder=None, tolerance=0.0):
+        self.batchBackup=batchBackup
+        self.prune=prune
+        self.maxIterations=maxIterations
+        self.budget=budget
+        self.recorder=recorder
+        self.tolerance=tolerance
+
+    @property
+    def gamma(self):
+        return self.batchBackup.gamma
+
+    def __call__(self, V, B):
+        if not isinstance(V, AlphaSet):
+            V=AlphaSet.fromList(V, self.batchBackup.model.stateSpace, self.batchBackup.model.actionSpace)
+        V=V.copy()
+        Bmatrix=self.batchBackup.model.beliefMatrix(B)
+        value=V.values(Bmatrix).max(axis=1)
+        prunedNumber=0
+        iteration=0
+        while not stopImprove(iteration, self.maxIterations, self.budget):
+            alphaSet=self.sweep(V, B)
+            V.extend(alphaSet.alphas, alphaSet.actions)
+            if self.prune is not None:
+                V=self.prune(V, Bmatrix)
+                prunedNumber+=self.prune.lastPrunedNumber
+            iteration+=1
+            value, previousValue=V.values(Bmatrix).max(axis=1), value
+            if np.max(value-previousValue) <= self.tolerance:
+                break
+        recordImprove(self.recorder, iteration, self.prune, prunedNumber)
+        return V
+
+    def sweep(self, V, B):
+        return self.batchBackup(V, B)
+
+
+def shiftToLowerBound(V, backedUp, B, gamma):
+    # if V exceeds its own backups by at most r at B, then V-r/(1-gamma) is below its backups there
+    if gamma >= 1:
+        raise ValueError('shifting to a lower bound needs gamma < 1, got %r' % (gamma,))
+    residual=max(0.0, float(np.max(Policy(V).value(B)-Policy(backedUp).value(B))))
+    shift=residual/(1-gamma)
+    if isinstance(V, AlphaSet):
+        shiftedV=V.empty()
+        shiftedV.extend(V.alphas-shift, V.actions)
+        return shiftedV, shift
+    return [{'action': alpha['action'], 'alpha': {s: value-shift for s, value in alpha['alpha'].items()}} for alpha in V], shift
+
+
+def recordImprove(recorder, iteration, prune, prunedNumber):
+    if recorder is not None:
+        recorder.count('sweeps', iteration)
+        if prune is not None:
+            recorder.count('pruned', prunedNumber)
+
+
+def stopImprove(iteration, maxIterations, budget):
+    if maxIterations is not None and iteration >= maxIterations:
+        return True
+    return budget is not None and budget.exhausted()
+
         
 class Backup(object):
     
-    def __init__(self, getBetaA, argmaxAlpha, stateSpace, actionSpace):
+    def __init__(self, getBetaA, argmaxAlpha, stateSpace, actionSpace, recorder=None):
         self.getBetaA=getBetaA
         self.argmaxAlpha=argmaxAlpha
         self.stateSpace=stateSpace
         self.actionSpace=actionSpace
+        self.recorder=recorder
             
     def __call__(self, V, b):
+        if self.recorder is not None:
+            self.recorder.count('backups')
         betaA={a: {s: self.getBetaA(V, b, s, a) for s in self.stateSpace} for a in self.actionSpace}
         alphaA=[{'action':a, 'alpha':alpha} for a, alpha in betaA.items()]
         beta=self.argmaxAlpha(alphaA, b)
@@ -83,11 +245,14 @@ class GetBetaAO(object):
 
 class SE(object):
     
-    def __init__(self, transitionFunction, observationFunction):
+    def __init__(self, transitionFunction, observationFunction, recorder=None):
         self.transitionFunction=transitionFunction
         self.observationFunction=observationFunction
+        self.recorder=recorder
         
     def __call__(self, b,a,o):
+        if self.recorder is not None:
+            self.recorder.count('beliefUpdates')
         bPrimeUnormalized={sPrime: self.observationFunction(sPrime, a, o)*sum([self.transitionFunction(s, a, sPrime)*ps for s, ps in b.items()]) for sPrime in b}
         alpha=sum(bPrimeUnormalized.values())
         if alpha==0:
@@ -95,9 +260,13 @@ class SE(object):
         bPrime={sPrime: bSPrimeUnormalized/alpha for sPrime, bSPrimeUnormalized in bPrimeUnormalized.items()}
         return bPrime
 
+BeliefTransition=SE
+
 
 def argmaxAlpha(V, b):
-    v=-np.Inf
+    if isinstance(V, AlphaSet):
+        return V[V.argmax(V.beliefVector(b))]
+    v=-np.inf
     for alpha in V:
         alphaTimesBValue=sum([alpha['alpha'][s]*b[s] for s in b.keys()])
         if alphaTimesBValue > v:
@@ -108,13 +277,14 @@ def argmaxAlpha(V, b):
 
 class Expand(object):
     
-    def __init__(self, se, actionSpace, observationSpace, furthestB):
+    def __init__(self, se, actionSpace, observationSpace, furthestB, recorder=None):
         self.se=se
         self.actionSpace=actionSpace
         self.observationSpace=observationSpace
         self.furthestB=furthestB
+        self.recorder=recorder
         
-    def __call__(self, B):
+    def __call__(self, B, V=None):
         BNew=B.copy()
         for b in B:
             successors=[self.se(b, a, o) for a in self.actionSpace for o in self.observationSpace]
@@ -122,11 +292,66 @@ class Expand(object):
             if successors != []:
                 bNew=self.furthestB(successors, B)
                 BNew.append(bNew)
+        if self.recorder is not None:
+            self.recorder.count('beliefsAdded', len(BNew)-len(B))
         return BNew
 
 
+class BatchExpand(object):
+
+    def __init__(self, batchBeliefTransition, furthestB, recorder=None):
+        self.batchBeliefTransition=batchBeliefTransition
+        self.furthestB=furthestB
+        self.recorder=recorder
+
+    def __call__(self, B, V=None):
+        model=self.batchBeliefTransition.model
+        bPrime, normalizer, valid=self.batchBeliefTransition(B)
+        BNew=B.copy()
+        for successorMatrix, mask in zip(bPrime, valid):
+            successors=[model.belief(vector) for vector in successorMatrix[mask]]
+            if successors != []:
+                bNew=self.furthestB(successors, B)
+                BNew.append(bNew)
+        if self.recorder is not None:
+            self.recorder.count('beliefUpdates', valid.size)
+            self.recorder.count('beliefsAdded', len(BNew)-len(B))
+        return BNew
+
+
+class IndexedExpand(object):
+
+    def __init__(self, batchBeliefTransition, tolerance=0.0, treeThreshold=1024, recorder=None, backend='numpy'):
+        self.batchBeliefTransition=batchBeliefTransition
+        self.tolerance=tolerance
+        self.treeThreshold=treeThreshold
+        self.recorder=recorder
+        self.backend=backend
+
+    def __call__(self, B, V=None):
+        model=self.batchBeliefTransition.model
+        Bmatrix=model.beliefMatrix(B)
+        beliefSet=BeliefSet(model.numberOfStates, self.tolerance, self.treeThreshold, 2*len(Bmatrix), self.backend)
+        beliefSet.load(Bmatrix)
+        bPrime, normalizer, valid=self.batchBeliefTransition(Bmatrix)
+        newBeliefs=[]
+        for successorMatrix, mask in zip(bPrime, valid):
+            successors=successorMatrix[mask]
+            if len(successors) == 0:
+                continue
+            index, distance=beliefSet.furthest(successors)
+            if beliefSet.add(successors[index]):
+                newBeliefs.append(successors[index])
+        if self.recorder is not None:
+            self.recorder.count('beliefUpdates', valid.size)
+            self.recorder.count('beliefsAdded', len(newBeliefs))
+        if isinstance(B, np.ndarray):
+            return np.vstack([Bmatrix]+newBeliefs)
+        return B.copy()+[model.belief(b) for b in newBeliefs]
+
+
 def furthestB(successors, B):
-    L1Distance=-np.Inf
+    L1Distance=-np.inf
     for bNew in successors:
         distance=min([sum([abs(bNew[s]-b[s]) for s in b.keys()]) for b in B])
         if distance > L1Distance:
@@ -134,6 +359,25 @@ def furthestB(successors, B):
             L1Distance=distance
     return bFurthest              
 
+
+class KernelFurthestB(object):
+
+    def __init__(self, backend='auto'):
+        self.kernels=getKernels(backend)
+        self._B=None
+        self._Bmatrix=None
+
+    def __call__(self, successors, B):
+        stateSpace=list(B[0].keys())
+        # Expand passes the same B for every belief of a round, so convert it once per round
+        if B is not self._B or len(B) != len(self._Bmatrix):
+            self._B=B
+            self._Bmatrix=np.array([[b[s] for s in stateSpace] for b in B])
+        successorMatrix=np.array([[bNew[s] for s in stateSpace] for bNew in successors])
+        distance=self.kernels.nearestL1(successorMatrix, self._Bmatrix)[0]
+        return successors[int(distance.argmax())]
+
+
 class GetPolicy(object):
     
     def __init__(self, argmaxAlpha):
@@ -0,0 +1,146 @@
+import numpy as np
+
+
+class AlphaSet(object):
+
+    def __init__(self, stateSpace, actionSpace, capacity=16, decimals=None):
+        self.stateSpace=list(stateSpace)
+        self.actionSpace=list(actionSpace)
+        self.stateIndex={s: i for i, s in enumerate(self.stateSpace)}
+        self.actionIndex={a: i for i, a in enumerate(self.actionSpace)}
+        self.decimals=decimals
+        self.size=0
+        self._alphas=np.empty((max(capacity, 1), len(self.stateSpace)), dtype=np.float64)
+        self._actions=np.empty(max(capacity, 1), dtype=np.int64)
+        self._keys={}
+
+    @classmethod
+    def fromList(cls, V, stateSpace, actionSpace, decimals=None):
+        alphaSet=cls(stateSpace, actionSpace, len(V), decimals)
+        for alpha in V:
+            alphaSet.append(alpha)
+        return alphaSet
+
+    @classmethod
+    def fromArrays(cls, alphas, actions, stateSpace, actionSpace, decimals=None):
+        # wraps the arrays without copying (they may be read-only memory maps); the first add copies them
+        alphaSet=cls(stateSpace, actionSpace, 1, decimals)
+        alphaSet._alphas=alphas
+        alphaSet._actions=actions
+        alphaSet.size=len(alphas)
+        alphaSet._keys=None
+        return alphaSet
+
+    @property
+    def keys(self):
+        if self._keys is None:
+            self._keys={}
+            for i, vector in enumerate(self.alphas):
+                self._keys.setdefault(self._key(vector), i)
+        return self._keys
+
+    @property
+    def alphas(self):
+        return self._alphas[:self.size]
+
+    @property
+    def actions(self):
+        return self._actions[:self.size]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        return {'action': self.actionSpace[self._actions[i]], 'alpha': {s: float(self._alphas[i, j]) for j, s in enumerate(self.stateSpace)}}
+
+    def __iter__(self):
+        return (self[i] for i in range(self.size))
+
+    def __contains__(self, alpha):
+        return self._key(self.alphaVector(alpha)) in self.keys
+
+    def __add__(self, V):
+        alphaSet=self.copy()
+        if isinstance(V, AlphaSet):
+            alphaSet.extend(V.alphas, V.actions)
+        else:
+            for alpha in V:
+                alphaSet.append(alpha)
+        return alphaSet
+
+    def _key(self, vector):
+        if self.decimals is not None:
+            vector=np.round(vector, self.decimals)
+        # adding 0.0 maps -0.0 to 0.0 so both hash alike
+        return (np.asarray(vector, dtype=np.float64)+0.0).tobytes()
+
+    def _reserve(self, size):
+        if size <= len(self._alphas):
+            return
+        capacity=max(size, 2*len(self._alphas))
+        alphas=np.empty((capacity, len(self.stateSpace)), dtype=np.float64)
+        actions=np.empty(capacity, dtype=np.int64)
+        alphas[:self.size]=self.alphas
+        actions[:self.size]=self.actions
+        self._alphas, self._actions=alphas, actions
+
+    def add(self, vector, actionIndex):
+        key=self._key(vector)
+        if key in self.keys:
+            return False
+        self._reserve(self.size+1)
+        self._alphas[self.size]=vector
+        self._actions[self.size]=actionIndex
+        self._keys[key]=self.size
+        self.size+=1
+        return True
+
+    def append(self, alpha):
+        return self.add(self.alphaVector(alpha), self.actionIndex[alpha['action']])
+
+    def extend(self, alphas, actions):
+        self._reserve(self.size+len(alphas))
+        return sum([self.add(vector, actionIndex) for vector, actionIndex in zip(alphas, actions)])
+
+    def copy(self):
+        alphaSet=AlphaSet(self.stateSpace, self.actionSpace, len(self._alphas), self.decimals)
+        alphaSet._alphas[:self.size]=self.alphas
+        alphaSet._actions[:self.size]=self.actions
+        alphaSet._keys=None if self._keys is None else self._keys.copy()
+        alphaSet.size=self.size
+        return alphaSet
+
+    def select(self, indices):
+        alphaSet=AlphaSet(self.stateSpace, self.actionSpace, len(indices), self.decimals)
+        alphaSet.extend(self.alphas[indices], self.actions[indices])
+        return alphaSet
+
+    def empty(self):
+        return AlphaSet(self.stateSpace, self.actionSpace, decimals=self.decimals)
+
+    def alphaVector(self, alpha):
+        vector=np.zeros(len(self.stateSpace))
+        for s, value in alpha['alpha'].items():
+            vector[self.stateIndex[s]]=value
+        return vector
+
+    def beliefVector(self, b):
+        if isinstance(b, dict):
+            return self.alphaVector({'alpha': b})
+        return np.asarray(b, dtype=np.float64)
+
+    def values(self, B):
+        return np.asarray(B, dtype=np.float64) @ self.alphas.T
+
+    def argmax(self, B):
+        return self.values(B).argmax(axis=-1)
+
+
+def toAlphaSet(V, stateSpace=None, actionSpace=None):
+    if isinstance(V, AlphaSet):
+        return V
+    if stateSpace is None:
+        stateSpace=list(V[0]['alpha'].keys())
+    if actionSpace is None:
+        actionSpace=list(dict.fromkeys([alpha['action'] for alpha in V]))
+    return AlphaSet.fromList(V, stateSpace, actionSpace)
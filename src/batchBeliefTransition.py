@@ -0,0 +1,17 @@
+import numpy as np
+
+
+class BatchBeliefTransition(object):
+
+    def __init__(self, model):
+        self.model=model
+
+    def __call__(self, B):
+        B=self.model.beliefMatrix(B)
+        predicted=self.model.predict(B)
+        observation=np.stack([self.model.observation(a).T for a in range(self.model.numberOfActions)])
+        unnormalized=predicted[:, :, None, :]*observation[None, :, :, :]
+        normalizer=unnormalized.sum(axis=3)
+        valid=normalizer > 0
+        bPrime=np.divide(unnormalized, normalizer[:, :, :, None], out=np.zeros_like(unnormalized), where=valid[:, :, :, None])
+        return bPrime, normalizer, valid
@@ -0,0 +1,82 @@
+import numpy as np
+from kernels import getKernels
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree=None
+
+
+class BeliefSet(object):
+
+    def __init__(self, numberOfStates, tolerance=0.0, treeThreshold=1024, capacity=16, backend='numpy'):
+        self.numberOfStates=numberOfStates
+        self.tolerance=tolerance
+        self.treeThreshold=treeThreshold
+        self.kernels=getKernels(backend)
+        self.size=0
+        self._beliefs=np.empty((max(capacity, 1), numberOfStates), dtype=np.float64)
+        self._tree=None
+        self._treeSize=0
+
+    @property
+    def beliefs(self):
+        return self._beliefs[:self.size]
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, size):
+        if size <= len(self._beliefs):
+            return
+        beliefs=np.empty((max(size, 2*len(self._beliefs)), self.numberOfStates), dtype=np.float64)
+        beliefs[:self.size]=self.beliefs
+        self._beliefs=beliefs
+
+    def _rebuild(self):
+        # beliefs inserted since the last rebuild are searched by brute force until they outnumber the tree
+        bufferSize=self.size-self._treeSize
+        if cKDTree is None or self.size < self.treeThreshold or bufferSize < max(self._treeSize, self.treeThreshold):
+            return
+        self._tree=cKDTree(self.beliefs.copy())
+        self._treeSize=self.size
+
+    def nearest(self, candidates):
+        candidates=np.atleast_2d(np.asarray(candidates, dtype=np.float64))
+        if self._tree is None:
+            return self.kernels.nearestL1(candidates, self.beliefs)
+        treeDistance, treeIndex=self._tree.query(candidates, k=1, p=1)
+        bufferDistance, bufferIndex=self.kernels.nearestL1(candidates, self.beliefs[self._treeSize:])
+        inBuffer=bufferDistance < treeDistance
+        return np.where(inBuffer, bufferDistance, treeDistance), np.where(inBuffer, bufferIndex+self._treeSize, treeIndex)
+
+    def minDistance(self, candidates):
+        return self.nearest(candidates)[0]
+
+    def add(self, b):
+        if self.size > 0 and self.minDistance(b)[0] <= self.tolerance:
+            return False
+        self._reserve(self.size+1)
+        self._beliefs[self.size]=b
+        self.size+=1
+        self._rebuild()
+        return True
+
+    def extend(self, B):
+        return sum([self.add(b) for b in np.atleast_2d(B)])
+
+    def load(self, B):
+        # bulk insert for beliefs that are already free of duplicates, such as the current B:
+        # no per-belief nearest query, and the tree is built once
+        B=np.atleast_2d(np.asarray(B, dtype=np.float64))
+        self._reserve(self.size+len(B))
+        self._beliefs[self.size:self.size+len(B)]=B
+        self.size+=len(B)
+        if cKDTree is not None and self.size >= self.treeThreshold:
+            self._tree=cKDTree(self.beliefs.copy())
+            self._treeSize=self.size
+        return len(B)
+
+    def furthest(self, candidates):
+        distance=self.minDistance(candidates)
+        return distance.argmax(), distance.max()
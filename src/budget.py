@@ -0,0 +1,23 @@
+import time
+
+
+class Budget(object):
+
+    def __init__(self, timeLimit=None, clock=time.perf_counter):
+        self.timeLimit=timeLimit
+        self.clock=clock
+        self.startTime=None
+
+    def start(self):
+        self.startTime=self.clock()
+
+    def elapsed(self):
+        if self.startTime is None:
+            return 0.0
+        return self.clock()-self.startTime
+
+    def exhausted(self):
+        # components used on their own never call start(), so the first check starts the clock
+        if self.startTime is None:
+            self.start()
+        return self.timeLimit is not None and self.elapsed() >= self.timeLimit
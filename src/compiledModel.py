@@ -0,0 +1,116 @@
+import numpy as np
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse=None
+
+
+def isSparse(matrix):
+    return sparse is not None and sparse.issparse(matrix)
+
+
+def selectStorage(matrices, densityThreshold):
+    # one 2-D block per action, kept as CSR when its nonzeros are below densityThreshold
+    if isinstance(matrices, np.ndarray) or not any([isSparse(matrix) for matrix in matrices]):
+        matrices=np.asarray(matrices, dtype=np.float64)
+        if sparse is None or densityThreshold is None or matrices.size == 0:
+            return matrices
+        density=np.count_nonzero(matrices)/matrices.size
+        if density >= densityThreshold:
+            return matrices
+        return [sparse.csr_matrix(matrix) for matrix in matrices]
+    matrices=[sparse.csr_matrix(matrix, dtype=np.float64) for matrix in matrices]
+    density=sum([matrix.nnz for matrix in matrices])/sum([np.prod(matrix.shape) for matrix in matrices])
+    if densityThreshold is not None and density < densityThreshold:
+        return matrices
+    return np.array([matrix.toarray() for matrix in matrices])
+
+
+class CompiledModel(object):
+
+    def __init__(self, stateSpace, actionSpace, observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold=0.1):
+        self.stateSpace=list(stateSpace)
+        self.actionSpace=list(actionSpace)
+        self.observationSpace=list(observationSpace)
+        self.stateIndex={s: i for i, s in enumerate(self.stateSpace)}
+        self.actionIndex={a: i for i, a in enumerate(self.actionSpace)}
+        self.observationIndex={o: i for i, o in enumerate(self.observationSpace)}
+        # T[a, s, sPrime], Z[a, sPrime, o], R[a, s] (expected immediate reward);
+        # T and Z are either dense 3-D arrays or lists of per-action CSR matrices
+        self.transitionMatrix=selectStorage(transitionMatrix, densityThreshold)
+        self.observationMatrix=selectStorage(observationMatrix, densityThreshold)
+        self.rewardMatrix=np.asarray(rewardMatrix, dtype=np.float64)
+
+    @property
+    def isSparse(self):
+        return not isinstance(self.transitionMatrix, np.ndarray) or not isinstance(self.observationMatrix, np.ndarray)
+
+    def transition(self, actionIndex):
+        return self.transitionMatrix[actionIndex]
+
+    def observation(self, actionIndex):
+        observation=self.observationMatrix[actionIndex]
+        if isSparse(observation):
+            return observation.toarray()
+        return observation
+
+    def predict(self, B):
+        if isinstance(self.transitionMatrix, np.ndarray):
+            return np.einsum('ns,ast->nat', B, self.transitionMatrix)
+        return np.stack([np.asarray(B @ transition) for transition in self.transitionMatrix], axis=1)
+
+    @property
+    def numberOfStates(self):
+        return len(self.stateSpace)
+
+    @property
+    def numberOfActions(self):
+        return len(self.actionSpace)
+
+    @property
+    def numberOfObservations(self):
+        return len(self.observationSpace)
+
+    def transitionFunction(self, s, a, sPrime):
+        return self.transitionMatrix[self.actionIndex[a]][self.stateIndex[s], self.stateIndex[sPrime]]
+
+    def observationFunction(self, sPrime, a, o):
+        return self.observationMatrix[self.actionIndex[a]][self.stateIndex[sPrime], self.observationIndex[o]]
+
+    def rewardFunction(self, s, a, sPrime):
+        return self.rewardMatrix[self.actionIndex[a], self.stateIndex[s]]
+
+    def beliefVector(self, b):
+        vector=np.zeros(self.numberOfStates)
+        for s, ps in b.items():
+            vector[self.stateIndex[s]]=ps
+        return vector
+
+    def beliefMatrix(self, B):
+        if isinstance(B, np.ndarray):
+            return np.atleast_2d(B)
+        return np.array([self.beliefVector(b) for b in B]).reshape(len(B), self.numberOfStates)
+
+    def belief(self, vector):
+        return {s: float(vector[i]) for i, s in enumerate(self.stateSpace)}
+
+    def alphaVector(self, alpha):
+        return self.beliefVector(alpha['alpha'])
+
+    def alpha(self, vector, actionIndex):
+        return {'action': self.actionSpace[actionIndex], 'alpha': self.belief(vector)}
+
+
+def compileModel(transitionFunction, observationFunction, rewardFunction, stateSpace, actionSpace, observationSpace, densityThreshold=0.1):
+    stateSpace=list(stateSpace)
+    actionSpace=list(actionSpace)
+    observationSpace=list(observationSpace)
+    transitionMatrix=np.array([[[transitionFunction(s, a, sPrime) for sPrime in stateSpace] for s in stateSpace] for a in actionSpace],
+                              dtype=np.float64).reshape(len(actionSpace), len(stateSpace), len(stateSpace))
+    observationMatrix=np.array([[[observationFunction(sPrime, a, o) for o in observationSpace] for sPrime in stateSpace] for a in actionSpace],
+                               dtype=np.float64).reshape(len(actionSpace), len(stateSpace), len(observationSpace))
+    rewardMatrix=np.array([[sum([rewardFunction(s, a, sPrime)*transitionMatrix[i, j, k] for k, sPrime in enumerate(stateSpace)])
+                            for j, s in enumerate(stateSpace)] for i, a in enumerate(actionSpace)],
+                          dtype=np.float64).reshape(len(actionSpace), len(stateSpace))
+    return CompiledModel(stateSpace, actionSpace, observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
@@ -0,0 +1,252 @@
+"""
+Generators for standard POMDP benchmark domains, built directly as CompiledModel arrays.
+Tiger: Kaelbling, L. P., Littman, M. L., & Cassandra, A. R. (1998). Planning and acting in partially observable stochastic domains.
+Hallway-style navigation: Littman, M. L., Cassandra, A. R., & Kaelbling, L. P. (1995). Learning policies for partially observable environments: Scaling up.
+Tag: Pineau, J., Gordon, G., & Thrun, S. (2003). Point-based value iteration: An anytime algorithm for POMDPs.
+RockSample: Smith, T., & Simmons, R. (2004). Heuristic search value iteration for POMDPs.
+"""
+
+import itertools
+import numpy as np
+from compiledModel import CompiledModel
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse=None
+
+moves={'north': (0, 1), 'south': (0, -1), 'east': (1, 0), 'west': (-1, 0)}
+
+
+def buildMatrices(numberOfActions, numberOfRows, numberOfColumns, entries):
+    # entries maps action index to (rows, columns, values) triples; duplicates are summed
+    if sparse is None:
+        matrices=np.zeros((numberOfActions, numberOfRows, numberOfColumns))
+        for a, (rows, columns, values) in entries.items():
+            np.add.at(matrices[a], (rows, columns), values)
+        return matrices
+    return [sparse.csr_matrix(sparse.coo_matrix((entries[a][2], (entries[a][0], entries[a][1])), shape=(numberOfRows, numberOfColumns)))
+            for a in range(numberOfActions)]
+
+
+def tiger(rewardParam=None, observationParam=None, densityThreshold=0.1):
+    if rewardParam is None:
+        rewardParam={'listen_cost':-1, 'open_incorrect_cost':-100, 'open_correct_reward':10}
+    if observationParam is None:
+        observationParam={'obs_correct_prob':0.85, 'obs_incorrect_prob':0.15}
+    stateSpace=['tiger-left', 'tiger-right']
+    actionSpace=['open-left', 'open-right', 'listen']
+    observationSpace=['tiger-left', 'tiger-right', 'Nothing']
+    correct, incorrect=observationParam['obs_correct_prob'], observationParam['obs_incorrect_prob']
+    transitionMatrix=np.array([np.full((2, 2), 0.5), np.full((2, 2), 0.5), np.eye(2)])
+    observationMatrix=np.array([[[0, 0, 1], [0, 0, 1]], [[0, 0, 1], [0, 0, 1]], [[correct, incorrect, 0], [incorrect, correct, 0]]])
+    rewardMatrix=np.array([[rewardParam['open_incorrect_cost'], rewardParam['open_correct_reward']],
+                           [rewardParam['open_correct_reward'], rewardParam['open_incorrect_cost']],
+                           [rewardParam['listen_cost'], rewardParam['listen_cost']]])
+    return CompiledModel(stateSpace, actionSpace, observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
+
+
+def hallway(length=8, slip=0.1, observationNoise=0.1, densityThreshold=0.1):
+    # a corridor with side rooms every other cell; state is (cell, heading), goal is the last side room
+    headings=['north', 'east', 'south', 'west']
+    corridor=[(x, 0) for x in range(length)]
+    rooms=[(x, 1) for x in range(0, length, 2)]
+    cells=corridor+rooms
+    goal=rooms[-1]
+    stateSpace=[(cell, heading) for cell in cells for heading in headings]
+    stateIndex={s: i for i, s in enumerate(stateSpace)}
+    actionSpace=['stay', 'forward', 'turn-left', 'turn-right', 'turn-around']
+    cellSet=set(cells)
+
+    def wallPattern(cell, heading):
+        turn=headings.index(heading)
+        return tuple([(cell[0]+moves[headings[(turn+k)%4]][0], cell[1]+moves[headings[(turn+k)%4]][1]) not in cellSet for k in range(4)])
+
+    patterns=sorted(set([wallPattern(cell, heading) for cell, heading in stateSpace]))
+    observationSpace=patterns+['goal']
+    observationIndex={o: i for i, o in enumerate(observationSpace)}
+
+    def intended(state, action):
+        cell, heading=state
+        turn=headings.index(heading)
+        if action == 'forward':
+            nextCell=(cell[0]+moves[heading][0], cell[1]+moves[heading][1])
+            return (nextCell if nextCell in cellSet else cell, heading)
+        offset={'stay': 0, 'turn-right': 1, 'turn-around': 2, 'turn-left': 3}[action]
+        return (cell, headings[(turn+offset)%4])
+
+    transitionEntries={}
+    observationEntries={}
+    for a, action in enumerate(actionSpace):
+        rows, columns, values=[], [], []
+        for state in stateSpace:
+            i=stateIndex[state]
+            if state[0] == goal:
+                # reaching the goal resets the agent uniformly over the corridor
+                restart=[stateIndex[(cell, heading)] for cell in corridor for heading in headings]
+                rows+=[i]*len(restart)
+                columns+=restart
+                values+=[1/len(restart)]*len(restart)
+                continue
+            rows+=[i, i]
+            columns+=[stateIndex[intended(state, action)], i]
+            values+=[1-slip, slip]
+        transitionEntries[a]=(rows, columns, values)
+        rows, columns, values=[], [], []
+        for state in stateSpace:
+            i=stateIndex[state]
+            if state[0] == goal:
+                rows.append(i)
+                columns.append(observationIndex['goal'])
+                values.append(1.0)
+                continue
+            truePattern=observationIndex[wallPattern(*state)]
+            rows+=[i]*len(patterns)
+            columns+=list(range(len(patterns)))
+            values+=[1-observationNoise if j == truePattern else observationNoise/(len(patterns)-1) for j in range(len(patterns))]
+        observationEntries[a]=(rows, columns, values)
+    transitionMatrix=buildMatrices(len(actionSpace), len(stateSpace), len(stateSpace), transitionEntries)
+    observationMatrix=buildMatrices(len(actionSpace), len(stateSpace), len(observationSpace), observationEntries)
+    rewardMatrix=np.zeros((len(actionSpace), len(stateSpace)))
+    for state in stateSpace:
+        if state[0] == goal:
+            rewardMatrix[:, stateIndex[state]]=1.0
+    return CompiledModel(stateSpace, actionSpace, observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
+
+
+def tag(width=5, height=5, stayProbability=0.2, densityThreshold=0.1):
+    cells=[(x, y) for y in range(height) for x in range(width)]
+    cellIndex={cell: i for i, cell in enumerate(cells)}
+    stateSpace=[(robot, opponent) for robot in cells for opponent in cells]+['tagged']
+    stateIndex={s: i for i, s in enumerate(stateSpace)}
+    actionSpace=list(moves)+['tag']
+    observationSpace=[(robot, False) for robot in cells]+[(robot, True) for robot in cells]+['tagged']
+    observationIndex={o: i for i, o in enumerate(observationSpace)}
+
+    def step(cell, move):
+        nextCell=(cell[0]+moves[move][0], cell[1]+moves[move][1])
+        return nextCell if nextCell in cellIndex else cell
+
+    def opponentMoves(robot, opponent):
+        # the opponent moves away from the robot, choosing uniformly among distance-increasing moves
+        distance=abs(robot[0]-opponent[0])+abs(robot[1]-opponent[1])
+        away=[step(opponent, move) for move in moves
+              if abs(robot[0]-step(opponent, move)[0])+abs(robot[1]-step(opponent, move)[1]) > distance]
+        if away == []:
+            return [(opponent, 1.0)]
+        return [(opponent, stayProbability)]+[(cell, (1-stayProbability)/len(away)) for cell in away]
+
+    transitionEntries={}
+    observationEntries={}
+    rewardMatrix=np.zeros((len(actionSpace), len(stateSpace)))
+    for a, action in enumerate(actionSpace):
+        rows, columns, values=[], [], []
+        for state in stateSpace:
+            i=stateIndex[state]
+            if state == 'tagged':
+                rows.append(i)
+                columns.append(i)
+                values.append(1.0)
+                continue
+            robot, opponent=state
+            if action == 'tag':
+                if robot == opponent:
+                    rows.append(i)
+                    columns.append(stateIndex['tagged'])
+                    values.append(1.0)
+                    rewardMatrix[a, i]=10
+                    continue
+                nextRobot=robot
+                rewardMatrix[a, i]=-10
+            else:
+                nextRobot=step(robot, action)
+                rewardMatrix[a, i]=-1
+            for nextOpponent, probability in opponentMoves(robot, opponent):
+                rows.append(i)
+                columns.append(stateIndex[(nextRobot, nextOpponent)])
+                values.append(probability)
+        transitionEntries[a]=(rows, columns, values)
+        rows=list(range(len(stateSpace)))
+        columns=[observationIndex['tagged'] if state == 'tagged' else observationIndex[(state[0], state[0] == state[1])] for state in stateSpace]
+        observationEntries[a]=(rows, columns, [1.0]*len(rows))
+    transitionMatrix=buildMatrices(len(actionSpace), len(stateSpace), len(stateSpace), transitionEntries)
+    observationMatrix=buildMatrices(len(actionSpace), len(stateSpace), len(observationSpace), observationEntries)
+    return CompiledModel(stateSpace, actionSpace, observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
+
+
+def rockSample(size=4, rockNumber=4, halfEfficiencyDistance=20, seed=0, densityThreshold=0.1):
+    random=np.random.RandomState(seed)
+    positions=[(x, y) for x in range(size) for y in range(size)]
+    rocks=[positions[i] for i in random.choice(len(positions), rockNumber, replace=False)]
+    rockQualities=list(itertools.product([False, True], repeat=rockNumber))
+    stateSpace=[(position, qualities) for position in positions for qualities in rockQualities]+['terminal']
+    stateIndex={s: i for i, s in enumerate(stateSpace)}
+    actionSpace=list(moves)+['sample']+['check-%d' % k for k in range(rockNumber)]
+    observationSpace=['none', 'good', 'bad']
+    transitionEntries={}
+    observationEntries={}
+    rewardMatrix=np.zeros((len(actionSpace), len(stateSpace)))
+    for a, action in enumerate(actionSpace):
+        transitionRows, transitionColumns, transitionValues=[], [], []
+        observationRows, observationColumns, observationValues=[], [], []
+        for state in stateSpace:
+            i=stateIndex[state]
+            if state == 'terminal':
+                transitionRows.append(i)
+                transitionColumns.append(i)
+                transitionValues.append(1.0)
+                continue
+            position, qualities=state
+            nextState=state
+            if action in moves:
+                x, y=position[0]+moves[action][0], position[1]+moves[action][1]
+                if x >= size:
+                    nextState='terminal'
+                    rewardMatrix[a, i]=10
+                elif 0 <= x and 0 <= y < size:
+                    nextState=((x, y), qualities)
+            elif action == 'sample':
+                if position in rocks:
+                    k=rocks.index(position)
+                    rewardMatrix[a, i]=10 if qualities[k] else -10
+                    nextState=(position, qualities[:k]+(False,)+qualities[k+1:])
+                else:
+                    rewardMatrix[a, i]=-10
+            transitionRows.append(i)
+            transitionColumns.append(stateIndex[nextState])
+            transitionValues.append(1.0)
+        transitionEntries[a]=(transitionRows, transitionColumns, transitionValues)
+        # the observation depends on the state reached, which for check actions is the current state
+        for state in stateSpace:
+            i=stateIndex[state]
+            if state == 'terminal' or not action.startswith('check'):
+                observationRows.append(i)
+                observationColumns.append(0)
+                observationValues.append(1.0)
+                continue
+            position, qualities=state
+            k=int(action.split('-')[1])
+            distance=np.hypot(position[0]-rocks[k][0], position[1]-rocks[k][1])
+            accuracy=0.5*(1+2**(-distance/halfEfficiencyDistance))
+            observationRows+=[i, i]
+            observationColumns+=[1, 2]
+            observationValues+=[accuracy, 1-accuracy] if qualities[k] else [1-accuracy, accuracy]
+        observationEntries[a]=(observationRows, observationColumns, observationValues)
+    transitionMatrix=buildMatrices(len(actionSpace), len(stateSpace), len(stateSpace), transitionEntries)
+    observationMatrix=buildMatrices(len(actionSpace), len(stateSpace), len(observationSpace), observationEntries)
+    return CompiledModel(stateSpace, actionSpace, observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
+
+
+def initialBelief(model, domain):
+    b0=np.zeros(model.numberOfStates)
+    if domain == 'tag':
+        robot=model.stateSpace[0][0]
+        states=[i for i, s in enumerate(model.stateSpace) if s != 'tagged' and s[0] == robot]
+    elif domain == 'rockSample':
+        states=[i for i, s in enumerate(model.stateSpace) if s != 'terminal' and s[0] == (0, 0)]
+    elif domain == 'hallway':
+        states=[i for i, s in enumerate(model.stateSpace) if s[0][1] == 0]
+    else:
+        states=list(range(model.numberOfStates))
+    b0[states]=1/len(states)
+    return b0
@@ -0,0 +1,159 @@
+import numpy as np
+from alphaSet import toAlphaSet
+from beliefSet import BeliefSet
+
+
+def appendBeliefs(B, newBeliefs, model):
+    if isinstance(B, np.ndarray):
+        return np.vstack([B]+list(newBeliefs))
+    return B.copy()+[model.belief(b) for b in newBeliefs]
+
+
+def indexBeliefs(Bmatrix, tolerance, backend='numpy'):
+    beliefSet=BeliefSet(Bmatrix.shape[1], tolerance, capacity=2*len(Bmatrix), backend=backend)
+    beliefSet.load(Bmatrix)
+    return beliefSet
+
+
+class RandomActionExpand(object):
+
+    def __init__(self, batchBeliefTransition, budget=None, tolerance=0.0, seed=None, backend='numpy'):
+        self.batchBeliefTransition=batchBeliefTransition
+        self.budget=budget
+        self.tolerance=tolerance
+        self.backend=backend
+        self.random=np.random.RandomState(seed)
+
+    def __call__(self, B, V=None):
+        model=self.batchBeliefTransition.model
+        Bmatrix=model.beliefMatrix(B)
+        beliefSet=indexBeliefs(Bmatrix, self.tolerance, self.backend)
+        expanded=np.arange(len(Bmatrix))
+        if self.budget is not None and self.budget < len(expanded):
+            expanded=self.random.choice(expanded, self.budget, replace=False)
+        bPrime, normalizer, valid=self.batchBeliefTransition(Bmatrix[expanded])
+        newBeliefs=[]
+        for successorMatrix, observationProbability in zip(bPrime, normalizer):
+            a=self.random.randint(model.numberOfActions)
+            total=observationProbability[a].sum()
+            if total == 0:
+                continue
+            o=self.random.choice(model.numberOfObservations, p=observationProbability[a]/total)
+            if beliefSet.add(successorMatrix[a, o]):
+                newBeliefs.append(successorMatrix[a, o])
+        return appendBeliefs(B, newBeliefs, model)
+
+
+class GreedyErrorReductionExpand(object):
+
+    def __init__(self, batchBeliefTransition, gamma, budget=None, tolerance=0.0, backend='numpy'):
+        self.batchBeliefTransition=batchBeliefTransition
+        self.gamma=gamma
+        self.budget=budget
+        self.tolerance=tolerance
+        self.backend=backend
+
+    def __call__(self, B, V=None):
+        if V is None:
+            raise ValueError('GreedyErrorReductionExpand needs the current alpha set V')
+        model=self.batchBeliefTransition.model
+        alphaSet=toAlphaSet(V, model.stateSpace, model.actionSpace)
+        Bmatrix=model.beliefMatrix(B)
+        beliefSet=indexBeliefs(Bmatrix, self.tolerance, self.backend)
+        bPrime, normalizer, valid=self.batchBeliefTransition(Bmatrix)
+        # Pineau et al. (2006) error bound at each successor, taken from its nearest point in B
+        successors=bPrime[valid]
+        distance, nearest=beliefSet.kernels.nearestL1(successors, beliefSet.beliefs)
+        nearestB=beliefSet.beliefs[nearest]
+        nearestAlpha=alphaSet.alphas[alphaSet.argmax(nearestB)]
+        difference=successors-nearestB
+        vMax=model.rewardMatrix.max()/(1-self.gamma)
+        vMin=model.rewardMatrix.min()/(1-self.gamma)
+        bound=np.where(difference >= 0, vMax-nearestAlpha, vMin-nearestAlpha)
+        error=np.full(valid.shape, -np.inf)
+        error[valid]=(bound*difference).sum(axis=1)
+        expectedError=(normalizer*np.where(valid, error, 0)).sum(axis=2)
+        expectedError[~valid.any(axis=2)]=-np.inf
+        bestAction=expectedError.argmax(axis=1)
+        bestObservation=error[np.arange(len(Bmatrix)), bestAction].argmax(axis=1)
+        score=expectedError[np.arange(len(Bmatrix)), bestAction]
+        order=np.argsort(-score, kind='stable')
+        order=order[np.isfinite(score[order])]
+        newBeliefs=[]
+        for n in order:
+            if self.budget is not None and len(newBeliefs) >= self.budget:
+                break
+            successor=bPrime[n, bestAction[n], bestObservation[n]]
+            if beliefSet.add(successor):
+                newBeliefs.append(successor)
+        return appendBeliefs(B, newBeliefs, model)
+
+
+class BudgetedExpand(object):
+
+    def __init__(self, batchBeliefTransition, budget, tolerance=0.0, backend='numpy'):
+        self.batchBeliefTransition=batchBeliefTransition
+        self.budget=budget
+        self.tolerance=tolerance
+        self.backend=backend
+
+    def __call__(self, B, V=None):
+        model=self.batchBeliefTransition.model
+        Bmatrix=model.beliefMatrix(B)
+        beliefSet=indexBeliefs(Bmatrix, self.tolerance, self.backend)
+        bPrime, normalizer, valid=self.batchBeliefTransition(Bmatrix)
+        candidates=[]
+        for successorMatrix, mask in zip(bPrime, valid):
+            successors=successorMatrix[mask]
+            if len(successors) != 0:
+                candidates.append(successors[beliefSet.furthest(successors)[0]])
+        if candidates == []:
+            return appendBeliefs(B, [], model)
+        candidates=np.array(candidates)
+        distance=beliefSet.minDistance(candidates)
+        newBeliefs=[]
+        # farthest-point selection: each pick shrinks the remaining candidates' distances
+        while len(newBeliefs) < self.budget and distance.max() > self.tolerance:
+            index=distance.argmax()
+            newBeliefs.append(candidates[index])
+            distance=np.minimum(distance, np.abs(candidates-candidates[index]).sum(axis=1))
+        return appendBeliefs(B, newBeliefs, model)
+
+
+class GapExpand(object):
+
+    def __init__(self, batchBeliefTransition, upperBound, budget=None, tolerance=0.0, backend='numpy'):
+        self.batchBeliefTransition=batchBeliefTransition
+        self.upperBound=upperBound
+        self.budget=budget
+        self.tolerance=tolerance
+        self.backend=backend
+
+    def __call__(self, B, V=None):
+        if V is None:
+            raise ValueError('GapExpand needs the current alpha set V')
+        model=self.batchBeliefTransition.model
+        alphaSet=toAlphaSet(V, model.stateSpace, model.actionSpace)
+        Bmatrix=model.beliefMatrix(B)
+        beliefSet=indexBeliefs(Bmatrix, self.tolerance, self.backend)
+        successors=self.batchBeliefTransition(Bmatrix)
+        bPrime, normalizer, valid=successors
+        # HSVI-style choice: the action that is greedy for the upper bound, then the observation whose
+        # successor carries the largest probability-weighted gap
+        actionValues, successorValues=self.upperBound.lookahead(Bmatrix, successors)
+        successorGap=np.zeros(valid.shape)
+        successorGap[valid]=successorValues[valid]-alphaSet.values(bPrime[valid]).max(axis=1)
+        bestAction=actionValues.argmax(axis=1)
+        weightedGap=np.where(valid, normalizer*successorGap, -np.inf)[np.arange(len(Bmatrix)), bestAction]
+        bestObservation=weightedGap.argmax(axis=1)
+        gap=self.upperBound.value(Bmatrix)-alphaSet.values(Bmatrix).max(axis=1)
+        order=np.argsort(-gap, kind='stable')
+        order=order[np.isfinite(weightedGap[order, bestObservation[order]])]
+        newBeliefs=[]
+        for n in order:
+            if self.budget is not None and len(newBeliefs) >= self.budget:
+                break
+            successor=bPrime[n, bestAction[n], bestObservation[n]]
+            if beliefSet.add(successor):
+                newBeliefs.append(successor)
+        return appendBeliefs(B, newBeliefs, model)
@@ -0,0 +1,115 @@
+"""
+Inner loops of the backup and of the L1 nearest-belief search, with a NumPy reference and an
+optional numba backend that fuses each loop nest instead of building the full temporaries. Both backends
+break ties the same way (first maximum, first minimum) as np.argmax and np.argmin.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba=None
+
+try:
+    # np.dot inside njit calls SciPy's BLAS bindings, so the numba backend needs SciPy as well
+    import scipy.linalg
+except ImportError:
+    scipy=None
+
+
+def backupPointsNumpy(gammaAO, B, rewardMatrix, gamma):
+    values=np.einsum('aoks,ns->naok', gammaAO, B)
+    best=values.argmax(axis=3)
+    actionIndex, observationIndex=np.indices(best.shape[1:])
+    selected=gammaAO[actionIndex[None], observationIndex[None], best]
+    return rewardMatrix[None]+gamma*selected.sum(axis=2)
+
+
+def nearestL1Numpy(candidates, beliefs, chunkSize=256):
+    distance=np.full(len(candidates), np.inf)
+    index=np.zeros(len(candidates), dtype=np.int64)
+    if len(beliefs) == 0:
+        return distance, index
+    for start in range(0, len(candidates), chunkSize):
+        chunk=candidates[start:start+chunkSize]
+        distanceMatrix=np.abs(chunk[:, None, :]-beliefs[None, :, :]).sum(axis=2)
+        index[start:start+chunkSize]=distanceMatrix.argmin(axis=1)
+        distance[start:start+chunkSize]=distanceMatrix.min(axis=1)
+    return distance, index
+
+
+if numba is not None and scipy is not None:
+
+    @numba.njit(nogil=True)
+    def backupPointsLoop(gammaAO, BT, rewardMatrix, gamma):
+        # one (alphas x beliefs) product per (a, o) instead of the full (n, a, o, k) value tensor
+        numberOfActions, numberOfObservations, numberOfAlphas, numberOfStates=gammaAO.shape
+        numberOfBeliefs=BT.shape[1]
+        betaA=np.zeros((numberOfBeliefs, numberOfActions, numberOfStates))
+        for a in range(numberOfActions):
+            for o in range(numberOfObservations):
+                values=np.dot(gammaAO[a, o], BT)
+                for n in range(numberOfBeliefs):
+                    best=0
+                    for k in range(1, numberOfAlphas):
+                        if values[k, n] > values[best, n]:
+                            best=k
+                    for s in range(numberOfStates):
+                        betaA[n, a, s]+=gammaAO[a, o, best, s]
+        for n in range(numberOfBeliefs):
+            for a in range(numberOfActions):
+                for s in range(numberOfStates):
+                    betaA[n, a, s]=rewardMatrix[a, s]+gamma*betaA[n, a, s]
+        return betaA
+
+    @numba.njit(nogil=True)
+    def nearestL1Loop(candidates, beliefs):
+        distance=np.full(candidates.shape[0], np.inf)
+        index=np.zeros(candidates.shape[0], dtype=np.int64)
+        for i in range(candidates.shape[0]):
+            for j in range(beliefs.shape[0]):
+                total=0.0
+                for s in range(candidates.shape[1]):
+                    total+=abs(candidates[i, s]-beliefs[j, s])
+                    if total >= distance[i]:
+                        break
+                if total < distance[i]:
+                    distance[i]=total
+                    index[i]=j
+        return distance, index
+
+
+def backupPointsNumba(gammaAO, B, rewardMatrix, gamma):
+    return backupPointsLoop(np.ascontiguousarray(gammaAO, dtype=np.float64), np.ascontiguousarray(B.T, dtype=np.float64),
+                            np.ascontiguousarray(rewardMatrix, dtype=np.float64), float(gamma))
+
+
+def nearestL1Numba(candidates, beliefs):
+    return nearestL1Loop(np.ascontiguousarray(candidates, dtype=np.float64), np.ascontiguousarray(beliefs, dtype=np.float64))
+
+
+class Kernels(object):
+
+    def __init__(self, name, backupPoints, nearestL1):
+        self.name=name
+        self.backupPoints=backupPoints
+        self.nearestL1=nearestL1
+
+
+numpyKernels=Kernels('numpy', backupPointsNumpy, nearestL1Numpy)
+numbaKernels=None if numba is None or scipy is None else Kernels('numba', backupPointsNumba, nearestL1Numba)
+
+
+def availableBackends():
+    return ['numpy'] if numbaKernels is None else ['numpy', 'numba']
+
+
+def getKernels(backend='numpy'):
+    if backend == 'numpy' or (backend == 'auto' and numbaKernels is None):
+        return numpyKernels
+    if backend in ('numba', 'auto'):
+        if numbaKernels is None:
+            raise ImportError('the numba backend needs numba and scipy installed')
+        return numbaKernels
+    raise ValueError('unknown kernel backend %r' % (backend,))
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from alphaSet import AlphaSet
+from kernels import getKernels
+
+
+class MatrixBackup(object):
+
+    def __init__(self, model, gamma, roundingTolerance, workerNumber=1, recorder=None, backend='numpy'):
+        self.model=model
+        self.gamma=gamma
+        self.roundingTolerance=roundingTolerance
+        self.workerNumber=workerNumber
+        self.recorder=recorder
+        self.kernels=getKernels(backend)
+        self._executor=None
+
+    def __call__(self, V, B):
+        if isinstance(V, AlphaSet):
+            alphas=V.alphas
+        else:
+            alphas=np.array([self.model.alphaVector(alpha) for alpha in V]).reshape(len(V), self.model.numberOfStates)
+        B=self.model.beliefMatrix(B)
+        if self.recorder is None:
+            gammaAO=self.project(alphas)
+            alphaMatrix, actionIndices=self.backupPoints(gammaAO, B)
+        else:
+            start=self.recorder.clock()
+            gammaAO=self.project(alphas)
+            projected=self.recorder.clock()
+            alphaMatrix, actionIndices=self.backupPoints(gammaAO, B)
+            self.recorder.addTime('projectTime', projected-start)
+            self.recorder.addTime('backupTime', self.recorder.clock()-projected)
+            self.recorder.count('backups', len(B))
+        if isinstance(V, AlphaSet):
+            alphaSet=V.empty()
+            alphaSet.extend(alphaMatrix, actionIndices)
+            return alphaSet
+        return [self.model.alpha(vector, actionIndex) for vector, actionIndex in zip(alphaMatrix, actionIndices)]
+
+    def project(self, alphas):
+        # gammaAO[a, o, i, s] = sum_sPrime T[a, s, sPrime] Z[a, sPrime, o] alpha_i[sPrime], once per sweep over B
+        numberOfAlphas=len(alphas)
+        gammaAO=np.empty((self.model.numberOfActions, self.model.numberOfObservations, numberOfAlphas, self.model.numberOfStates))
+        for a in range(self.model.numberOfActions):
+            # columns of weighted are (o, i) pairs, so one (sparse or dense) product with T[a] projects them all
+            weighted=(self.model.observation(a)[:, :, None]*alphas.T[:, None, :]).reshape(self.model.numberOfStates, -1)
+            projected=np.asarray(self.model.transition(a) @ weighted)
+            gammaAO[a]=projected.reshape(self.model.numberOfStates, self.model.numberOfObservations, numberOfAlphas).transpose(1, 2, 0)
+        return gammaAO
+
+    def backupPoints(self, gammaAO, B):
+        if self.workerNumber <= 1 or len(B) < 2:
+            return self.backupChunk(gammaAO, B)
+        if self._executor is None:
+            self._executor=ThreadPoolExecutor(self.workerNumber)
+        # contiguous chunks of B, reassembled in submission order so results match the serial path
+        chunks=np.array_split(np.arange(len(B)), min(self.workerNumber, len(B)))
+        results=list(self._executor.map(lambda chunk: self.backupChunk(gammaAO, B[chunk]), chunks))
+        return np.concatenate([alphas for alphas, actions in results]), np.concatenate([actions for alphas, actions in results])
+
+    def backupChunk(self, gammaAO, B):
+        betaA=self.kernels.backupPoints(gammaAO, B, self.model.rewardMatrix, self.gamma)
+        betaA=np.round(betaA, self.roundingTolerance)
+        actionIndices=np.einsum('nas,ns->na', betaA, B).argmax(axis=1)
+        return betaA[np.arange(len(B)), actionIndices], actionIndices
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor=None
@@ -0,0 +1,98 @@
+import json
+import struct
+import numpy as np
+from alphaSet import AlphaSet, toAlphaSet
+
+# file layout: magic, uint64 header length, JSON header, then 64-byte aligned
+# float64 alphas (K x |S|), int64 actions (K) and float64 beliefs (N x |S|)
+policyMagic=b'PBVIPOL1'
+alignment=64
+
+
+class Policy(object):
+
+    def __init__(self, V, B=None, stateSpace=None, actionSpace=None, metadata=None):
+        self.V=V
+        self.B=B
+        self.metadata={} if metadata is None else metadata
+        self.alphaSet=toAlphaSet(V, stateSpace, actionSpace)
+        self.stateSpace=self.alphaSet.stateSpace
+        self.actionSpace=self.alphaSet.actionSpace
+        self._actionLabels=np.empty(len(self.actionSpace), dtype=object)
+        self._actionLabels[:]=self.actionSpace
+
+    def beliefMatrix(self, B):
+        if isinstance(B, dict):
+            return self.alphaSet.beliefVector(B)
+        if isinstance(B, (list, tuple)) and len(B) > 0 and isinstance(B[0], dict):
+            return np.array([self.alphaSet.beliefVector(b) for b in B])
+        return np.asarray(B, dtype=np.float64)
+
+    def actionIndex(self, B):
+        return self.alphaSet.actions[self.alphaSet.argmax(self.beliefMatrix(B))]
+
+    def action(self, B):
+        actionIndex=self.actionIndex(B)
+        actions=self._actionLabels[actionIndex]
+        if np.ndim(actionIndex) == 0:
+            return actions
+        return list(actions)
+
+    def value(self, B):
+        return self.alphaSet.values(self.beliefMatrix(B)).max(axis=-1)
+
+
+def toLabel(value):
+    if isinstance(value, list):
+        return tuple([toLabel(element) for element in value])
+    return value
+
+
+def align(offset):
+    return (offset+alignment-1)//alignment*alignment
+
+
+def savePolicy(policy, path, metadata=None):
+    alphas=np.ascontiguousarray(policy.alphaSet.alphas, dtype='<f8')
+    actions=np.ascontiguousarray(policy.alphaSet.actions, dtype='<i8')
+    beliefs=np.zeros((0, len(policy.stateSpace)), dtype='<f8') if policy.B is None else np.ascontiguousarray(policy.beliefMatrix(policy.B), dtype='<f8').reshape(-1, len(policy.stateSpace))
+    header={'stateSpace': policy.stateSpace, 'actionSpace': policy.actionSpace, 'alphaShape': list(alphas.shape),
+            'beliefShape': list(beliefs.shape), 'metadata': dict(policy.metadata, **({} if metadata is None else metadata))}
+    # offsets depend on the header length, so fix the header size with generous padding for the offset digits
+    header['alphaOffset']=header['actionOffset']=header['beliefOffset']=0
+    headerSize=len(json.dumps(header).encode())+3*20
+    alphaOffset=align(len(policyMagic)+8+headerSize)
+    actionOffset=align(alphaOffset+alphas.nbytes)
+    beliefOffset=align(actionOffset+actions.nbytes)
+    header.update({'alphaOffset': alphaOffset, 'actionOffset': actionOffset, 'beliefOffset': beliefOffset})
+    encodedHeader=json.dumps(header).encode().ljust(headerSize)
+    with open(path, 'wb') as policyFile:
+        policyFile.write(policyMagic+struct.pack('<Q', headerSize)+encodedHeader)
+        for offset, array in ((alphaOffset, alphas), (actionOffset, actions), (beliefOffset, beliefs)):
+            policyFile.write(b'\0'*(offset-policyFile.tell()))
+            policyFile.write(array.tobytes())
+
+
+def loadPolicy(path, mmap=True):
+    with open(path, 'rb') as policyFile:
+        if policyFile.read(len(policyMagic)) != policyMagic:
+            raise ValueError('%s is not a saved PBVI policy' % (path,))
+        headerSize=struct.unpack('<Q', policyFile.read(8))[0]
+        header=json.loads(policyFile.read(headerSize).decode())
+    stateSpace=[toLabel(s) for s in header['stateSpace']]
+    actionSpace=[toLabel(a) for a in header['actionSpace']]
+
+    def read(dtype, offset, shape):
+        if np.prod(shape) == 0:
+            return np.zeros(shape, dtype=dtype)
+        if mmap:
+            return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+        with open(path, 'rb') as policyFile:
+            policyFile.seek(offset)
+            return np.fromfile(policyFile, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+    alphas=read('<f8', header['alphaOffset'], header['alphaShape'])
+    actions=read('<i8', header['actionOffset'], header['alphaShape'][:1])
+    beliefs=read('<f8', header['beliefOffset'], header['beliefShape'])
+    alphaSet=AlphaSet.fromArrays(alphas, actions, stateSpace, actionSpace)
+    return Policy(alphaSet, beliefs if len(beliefs) > 0 else None, metadata=header['metadata'])
@@ -0,0 +1,329 @@
+"""
+Loader for Cassandra's .pomdp text format (http://www.pomdp.org/code/pomdp-file-spec.html).
+Entries are applied in file order with later entries overwriting earlier ones, and the arrays are
+assembled directly from index triples, so no per-entry Python callables are involved.
+"""
+
+import re
+import numpy as np
+from compiledModel import CompiledModel
+
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse=None
+
+keywords={'discount', 'values', 'states', 'actions', 'observations', 'start', 'T', 'O', 'R'}
+tokenPattern=re.compile(r'[^\s:]+|:')
+
+
+def tokenize(lines):
+    for line in lines:
+        for token in tokenPattern.findall(line.split('#', 1)[0]):
+            yield token
+
+
+class TokenStream(object):
+
+    def __init__(self, tokens):
+        self.tokens=tokens
+        self.buffer=[]
+
+    def peek(self, depth=0):
+        while len(self.buffer) <= depth:
+            token=next(self.tokens, None)
+            if token is None:
+                return None
+            self.buffer.append(token)
+        return self.buffer[depth]
+
+    def next(self):
+        token=self.peek()
+        if token is None:
+            raise ValueError('unexpected end of .pomdp file')
+        self.buffer.pop(0)
+        return token
+
+    def expect(self, expected):
+        token=self.next()
+        if token != expected:
+            raise ValueError('expected %r in .pomdp file, got %r' % (expected, token))
+
+    def atEntry(self):
+        token=self.peek()
+        return token is None or (token in keywords and (self.peek(1) == ':' or token == 'start'))
+
+    def numbers(self, count):
+        return np.array([float(self.next()) for i in range(count)])
+
+
+class LastWriteAssignments(object):
+
+    def __init__(self, shape):
+        self.shape=shape
+        self.keys=[]
+        self.values=[]
+        self.sequences=[]
+        self.fills={}
+        self.sequence=0
+
+    def assign(self, actions, rows, columns, values):
+        # every (action, row, column) combination; keys are built by broadcasting the index vectors
+        keys=(np.asarray(actions, dtype=np.int64)[:, None, None]*self.shape[1]+np.asarray(rows, dtype=np.int64)[None, :, None])*self.shape[2]+np.asarray(columns, dtype=np.int64)[None, None, :]
+        self.record(keys, values)
+
+    def assignPairs(self, actions, rows, columns, values):
+        # (row, column) pairs instead of their product, e.g. the diagonal of an identity matrix
+        keys=(np.asarray(actions, dtype=np.int64)[:, None]*self.shape[1]+np.asarray(rows, dtype=np.int64)[None, :])*self.shape[2]+np.asarray(columns, dtype=np.int64)[None, :]
+        self.record(keys, values)
+
+    def fill(self, actions, value):
+        # a whole-matrix entry such as "uniform" overrides every earlier write of those actions
+        self.sequence+=1
+        for a in actions:
+            self.fills[int(a)]=(self.sequence, value)
+
+    def record(self, keys, values):
+        self.sequence+=1
+        self.keys.append(keys.ravel())
+        self.values.append(np.broadcast_to(values, keys.shape).ravel())
+        self.sequences.append(self.sequence)
+
+    def entries(self):
+        if self.keys == []:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        # reversing first makes np.unique keep the last write of every key
+        keys=np.concatenate(self.keys)[::-1]
+        values=np.concatenate(self.values)[::-1]
+        sequences=np.repeat(self.sequences, [len(keys) for keys in self.keys])[::-1]
+        keys, last=np.unique(keys, return_index=True)
+        values, sequences=values[last], sequences[last]
+        actions, rest=np.divmod(keys, self.shape[1]*self.shape[2])
+        rows, columns=np.divmod(rest, self.shape[2])
+        fillSequences=np.zeros(self.shape[0], dtype=np.int64)
+        for a, (sequence, value) in self.fills.items():
+            fillSequences[a]=sequence
+        kept=sequences > fillSequences[actions]
+        return actions[kept], rows[kept], columns[kept], values[kept]
+
+    def matrices(self):
+        actions, rows, columns, values=self.entries()
+        if sparse is None:
+            matrices=np.zeros(self.shape)
+            for a, (sequence, value) in self.fills.items():
+                matrices[a]=value
+            matrices[actions, rows, columns]=values
+            return matrices
+        matrices=[]
+        for a in range(self.shape[0]):
+            selected=actions == a
+            if a in self.fills:
+                matrices.append(self.filledMatrix(self.fills[a][1], rows[selected], columns[selected], values[selected]))
+                continue
+            nonzero=values[selected] != 0
+            matrices.append(sparse.csr_matrix((values[selected][nonzero], (rows[selected][nonzero], columns[selected][nonzero])), shape=self.shape[1:]))
+        return matrices
+
+    def filledMatrix(self, value, rows, columns, values):
+        # every entry is stored anyway, so write the CSR arrays directly instead of converting a dense copy
+        numberOfRows, numberOfColumns=self.shape[1:]
+        data=np.full(numberOfRows*numberOfColumns, value, dtype=np.float64)
+        data[rows*numberOfColumns+columns]=values
+        indices=np.tile(np.arange(numberOfColumns, dtype=np.int32), numberOfRows)
+        indptr=np.arange(0, numberOfRows*numberOfColumns+1, numberOfColumns, dtype=np.int64)
+        matrix=sparse.csr_matrix((data, indices, indptr), shape=self.shape[1:])
+        matrix.eliminate_zeros()
+        return matrix
+
+
+class PomdpFileParser(object):
+
+    def __init__(self, tokens):
+        self.stream=TokenStream(tokens)
+        self.discount=None
+        self.valueSign=1.0
+        self.stateSpace=None
+        self.actionSpace=None
+        self.observationSpace=None
+        self.start=None
+        self.sequence=0
+
+    def names(self):
+        if not self.stream.atEntry() and re.fullmatch(r'\d+', self.stream.peek()) and (self.stream.peek(1) is None or self.stream.peek(1) in keywords):
+            return list(range(int(self.stream.next())))
+        names=[]
+        while not self.stream.atEntry():
+            names.append(self.stream.next())
+        return names
+
+    def indices(self, token, space):
+        if token == '*':
+            return np.arange(len(space))
+        if token in self.index[id(space)]:
+            return np.array([self.index[id(space)][token]])
+        if re.fullmatch(r'\d+', token):
+            if int(token) >= len(space):
+                raise ValueError('index %r out of range in .pomdp file' % (token,))
+            return np.array([int(token)])
+        raise ValueError('unknown name %r in .pomdp file' % (token,))
+
+    def parsePreamble(self):
+        while True:
+            token=self.stream.peek()
+            if token in ('T', 'O', 'R') or token is None:
+                break
+            self.stream.next()
+            if token == 'start':
+                self.parseStart()
+                continue
+            self.stream.expect(':')
+            if token == 'discount':
+                self.discount=float(self.stream.next())
+            elif token == 'values':
+                self.valueSign=-1.0 if self.stream.next() == 'cost' else 1.0
+            elif token == 'states':
+                self.stateSpace=self.names()
+            elif token == 'actions':
+                self.actionSpace=self.names()
+            elif token == 'observations':
+                self.observationSpace=self.names()
+            else:
+                raise ValueError('unknown .pomdp preamble entry %r' % (token,))
+        if self.stateSpace is None or self.actionSpace is None or self.observationSpace is None:
+            raise ValueError('.pomdp file must declare states, actions and observations')
+        self.index={id(space): {str(name): i for i, name in enumerate(space)} for space in (self.stateSpace, self.actionSpace, self.observationSpace)}
+
+    def parseStart(self):
+        mode=None
+        if self.stream.peek() in ('include', 'exclude'):
+            mode=self.stream.next()
+        self.stream.expect(':')
+        self.start=(mode, [])
+        while not self.stream.atEntry():
+            self.start[1].append(self.stream.next())
+
+    def startBelief(self):
+        numberOfStates=len(self.stateSpace)
+        if self.start is None or self.start[1] == ['uniform']:
+            return np.full(numberOfStates, 1/numberOfStates)
+        mode, tokens=self.start
+        if mode is None and len(tokens) == numberOfStates and all([re.fullmatch(r'[-+]?[\d.]+([eE][-+]?\d+)?', token) for token in tokens]):
+            return np.array([float(token) for token in tokens])
+        chosen=np.zeros(numberOfStates, dtype=bool)
+        for token in tokens:
+            chosen[self.indices(token, self.stateSpace)]=True
+        if mode == 'exclude':
+            chosen=~chosen
+        return chosen/chosen.sum()
+
+    def parseVector(self, length):
+        if self.stream.peek() == 'uniform':
+            self.stream.next()
+            return np.full(length, 1/length)
+        return self.stream.numbers(length)
+
+    def parseMatrix(self, assignments, actions, named):
+        rows, columns=assignments.shape[1:]
+        token=self.stream.peek()
+        if token == 'uniform':
+            self.stream.next()
+            assignments.fill(actions, 1/columns)
+        elif token == 'identity' and named:
+            self.stream.next()
+            assignments.assignPairs(actions, np.arange(rows), np.arange(rows), 1.0)
+        else:
+            assignments.assign(actions, np.arange(rows), np.arange(columns), self.stream.numbers(rows*columns).reshape(rows, columns))
+
+    def parseSpecifiers(self, spaces):
+        specifiers=[self.indices(self.stream.next(), spaces[0])]
+        for space in spaces[1:]:
+            if self.stream.peek() != ':':
+                break
+            self.stream.next()
+            specifiers.append(self.indices(self.stream.next(), space))
+        return specifiers
+
+    def parse(self):
+        self.parsePreamble()
+        numberOfStates, numberOfActions, numberOfObservations=len(self.stateSpace), len(self.actionSpace), len(self.observationSpace)
+        transitions=LastWriteAssignments((numberOfActions, numberOfStates, numberOfStates))
+        observations=LastWriteAssignments((numberOfActions, numberOfStates, numberOfObservations))
+        # rewards keyed on (a, s) alone go to a dense table; (s', o)-specific ones are kept with their sequence number
+        baseReward=np.zeros((numberOfActions, numberOfStates))
+        baseSequence=np.full((numberOfActions, numberOfStates), -1, dtype=np.int64)
+        detailedRewards=LastWriteAssignments((numberOfActions*numberOfStates, numberOfStates, numberOfObservations))
+        detailedSequences=LastWriteAssignments((numberOfActions*numberOfStates, numberOfStates, numberOfObservations))
+        while self.stream.peek() is not None:
+            kind=self.stream.next()
+            self.stream.expect(':')
+            self.sequence+=1
+            if kind == 'T':
+                specifiers=self.parseSpecifiers([self.actionSpace, self.stateSpace, self.stateSpace])
+                if len(specifiers) == 3:
+                    transitions.assign(specifiers[0], specifiers[1], specifiers[2], float(self.stream.next()))
+                elif len(specifiers) == 2:
+                    transitions.assign(specifiers[0], specifiers[1], np.arange(numberOfStates), self.parseVector(numberOfStates))
+                else:
+                    self.parseMatrix(transitions, specifiers[0], True)
+            elif kind == 'O':
+                specifiers=self.parseSpecifiers([self.actionSpace, self.stateSpace, self.observationSpace])
+                if len(specifiers) == 3:
+                    observations.assign(specifiers[0], specifiers[1], specifiers[2], float(self.stream.next()))
+                elif len(specifiers) == 2:
+                    observations.assign(specifiers[0], specifiers[1], np.arange(numberOfObservations), self.parseVector(numberOfObservations))
+                else:
+                    self.parseMatrix(observations, specifiers[0], False)
+            elif kind == 'R':
+                tokens=[self.stream.next()]
+                while self.stream.peek() == ':' and len(tokens) < 4:
+                    self.stream.next()
+                    tokens.append(self.stream.next())
+                spaces=[self.actionSpace, self.stateSpace, self.stateSpace, self.observationSpace]
+                specifiers=[self.indices(token, space) for token, space in zip(tokens, spaces)]
+                if len(tokens) == 4:
+                    values=float(self.stream.next())
+                    if tokens[2] == '*' and tokens[3] == '*':
+                        baseReward[np.ix_(specifiers[0], specifiers[1])]=values
+                        baseSequence[np.ix_(specifiers[0], specifiers[1])]=self.sequence
+                        continue
+                elif len(tokens) == 3:
+                    values=self.stream.numbers(numberOfObservations)
+                    specifiers.append(np.arange(numberOfObservations))
+                elif len(tokens) == 2:
+                    values=self.stream.numbers(numberOfStates*numberOfObservations).reshape(numberOfStates, numberOfObservations)
+                    specifiers+=[np.arange(numberOfStates), np.arange(numberOfObservations)]
+                else:
+                    raise ValueError('R entries need at least an action and a start state')
+                actionState=(specifiers[0][:, None]*numberOfStates+specifiers[1][None, :]).ravel()
+                detailedRewards.assign(actionState, specifiers[2], specifiers[3], values)
+                detailedSequences.assign(actionState, specifiers[2], specifiers[3], self.sequence)
+            else:
+                raise ValueError('unknown .pomdp entry %r' % (kind,))
+        transitionMatrix=transitions.matrices()
+        observationMatrix=observations.matrices()
+        rewardMatrix=self.expectedReward(baseReward, baseSequence, detailedRewards, detailedSequences, transitionMatrix, observationMatrix)
+        return transitionMatrix, observationMatrix, self.valueSign*rewardMatrix
+
+    def expectedReward(self, baseReward, baseSequence, detailedRewards, detailedSequences, transitionMatrix, observationMatrix):
+        numberOfStates=len(self.stateSpace)
+        actionState, endStates, observations, values=detailedRewards.entries()
+        sequences=detailedSequences.entries()[3]
+        actions, states=np.divmod(actionState, numberOfStates)
+        newer=sequences > baseSequence[actions, states]
+        actions, states, endStates, observations, values=actions[newer], states[newer], endStates[newer], observations[newer], values[newer]
+        rewardMatrix=baseReward.copy()
+        for a in np.unique(actions):
+            selected=actions == a
+            transition=np.asarray(transitionMatrix[a][states[selected], endStates[selected]]).ravel()
+            observation=np.asarray(observationMatrix[a][endStates[selected], observations[selected]]).ravel()
+            correction=transition*observation*(values[selected]-baseReward[a, states[selected]])
+            np.add.at(rewardMatrix[a], states[selected], correction)
+        return rewardMatrix
+
+
+def loadPOMDP(path, densityThreshold=0.1):
+    with open(path) as pomdpFile:
+        parser=PomdpFileParser(tokenize(pomdpFile))
+        transitionMatrix, observationMatrix, rewardMatrix=parser.parse()
+    model=CompiledModel(parser.stateSpace, parser.actionSpace, parser.observationSpace, transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
+    return model, parser.discount, parser.startBelief()
@@ -0,0 +1,65 @@
+import numpy as np
+from alphaSet import AlphaSet, toAlphaSet
+
+
+def pointwiseUndominated(alphas, tolerance):
+    keep=np.ones(len(alphas), dtype=bool)
+    for i in range(len(alphas)):
+        others=keep.copy()
+        others[i]=False
+        if np.all(alphas[others] >= alphas[i]-tolerance, axis=1).any():
+            keep[i]=False
+    return np.flatnonzero(keep)
+
+
+def beliefUndominated(alphas, B):
+    return np.unique((B @ alphas.T).argmax(axis=1))
+
+
+def lpUndominated(alphas, tolerance):
+    from scipy.optimize import linprog
+    keep=np.ones(len(alphas), dtype=bool)
+    numberOfStates=alphas.shape[1]
+    for i in range(len(alphas)):
+        others=keep.copy()
+        others[i]=False
+        if not others.any():
+            continue
+        # maximize delta subject to b.(alpha_j-alpha_i)+delta <= 0 for all other j, b in the simplex
+        c=np.zeros(numberOfStates+1)
+        c[-1]=-1
+        A=np.hstack([alphas[others]-alphas[i], np.ones((others.sum(), 1))])
+        Aeq=np.hstack([np.ones((1, numberOfStates)), np.zeros((1, 1))])
+        bounds=[(0, None)]*numberOfStates+[(None, None)]
+        result=linprog(c, A_ub=A, b_ub=np.zeros(len(A)), A_eq=Aeq, b_eq=[1], bounds=bounds, method='highs')
+        if result.status == 0 and -result.fun <= tolerance:
+            keep[i]=False
+    return np.flatnonzero(keep)
+
+
+class Prune(object):
+
+    def __init__(self, strength='belief', tolerance=1e-9):
+        if strength not in ('pointwise', 'belief', 'lp'):
+            raise ValueError("strength must be 'pointwise', 'belief' or 'lp', got %r" % (strength,))
+        self.strength=strength
+        self.tolerance=tolerance
+        self.prunedNumber=0
+        self.lastPrunedNumber=0
+
+    def __call__(self, V, B):
+        if len(V) == 0:
+            return V
+        alphaSet=toAlphaSet(V)
+        alphas=alphaSet.alphas
+        keep=pointwiseUndominated(alphas, self.tolerance)
+        if self.strength == 'belief':
+            B=np.array([alphaSet.beliefVector(b) for b in B]).reshape(len(B), alphas.shape[1])
+            keep=keep[beliefUndominated(alphas[keep], B)]
+        elif self.strength == 'lp':
+            keep=keep[lpUndominated(alphas[keep], self.tolerance)]
+        self.lastPrunedNumber=len(V)-len(keep)
+        self.prunedNumber+=self.lastPrunedNumber
+        if isinstance(V, AlphaSet):
+            return V.select(keep)
+        return [V[i] for i in keep]
@@ -0,0 +1,64 @@
+"""
+Per-iteration counters and phase timings for the solver components. Every component takes an
+optional recorder and skips all bookkeeping when it is None, so instrumentation costs nothing
+unless it is switched on.
+
+    records=[]
+    recorder=Recorder(records.append)
+    recorder=Recorder(JsonLinesSink(open('solve.jsonl', 'a')))
+"""
+
+import collections
+import json
+import time
+
+
+class Recorder(object):
+
+    def __init__(self, sink, clock=time.perf_counter):
+        self.sink=sink
+        self.clock=clock
+        self.counts=collections.Counter()
+        self.times=collections.Counter()
+
+    def count(self, name, number=1):
+        self.counts[name]+=number
+
+    def addTime(self, name, seconds):
+        self.times[name]+=seconds
+
+    def counted(self, name, function):
+        return CountedCall(self, name, function)
+
+    def flush(self, phase, iteration, **fields):
+        # one record per solver phase; counters restart so every record covers only its own phase
+        record={'phase': phase, 'iteration': iteration}
+        record.update(fields)
+        record.update({name: int(number) for name, number in self.counts.items()})
+        record.update({name: float(seconds) for name, seconds in self.times.items()})
+        self.counts.clear()
+        self.times.clear()
+        self.sink(record)
+        return record
+
+
+class CountedCall(object):
+
+    def __init__(self, recorder, name, function):
+        self.recorder=recorder
+        self.name=name
+        self.function=function
+
+    def __call__(self, *args):
+        self.recorder.count(self.name)
+        return self.function(*args)
+
+
+class JsonLinesSink(object):
+
+    def __init__(self, stream):
+        self.stream=stream
+
+    def __call__(self, record):
+        self.stream.write(json.dumps(record)+'\n')
+        self.stream.flush()
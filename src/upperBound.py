@@ -0,0 +1,142 @@
+"""
+Upper bound on the optimal value, kept alongside the lower-bound alpha set so that the gap between
+the two measures how far a policy can be from optimal. The bound starts from the QMDP or FIB
+(Hauskrecht, 2000) state-action values and is tightened by sawtooth point updates.
+"""
+
+import numpy as np
+from alphaSet import toAlphaSet
+
+
+def qmdpValues(model, gamma, tolerance=1e-6, maxIterations=1000):
+    # starting above every value keeps each iterate an upper bound, so stopping early stays safe
+    Q=np.full((model.numberOfActions, model.numberOfStates), model.rewardMatrix.max()/(1-gamma))
+    for i in range(maxIterations):
+        V=Q.max(axis=0)
+        QNew=np.array([model.rewardMatrix[a]+gamma*np.asarray(model.transition(a) @ V).ravel() for a in range(model.numberOfActions)])
+        change=np.abs(QNew-Q).max()
+        Q=QNew
+        if change < tolerance:
+            break
+    return Q
+
+
+def fibValues(model, gamma, tolerance=1e-6, maxIterations=1000):
+    # like QMDP, but the next action may only depend on the observation, not on the next state
+    Q=np.full((model.numberOfActions, model.numberOfStates), model.rewardMatrix.max()/(1-gamma))
+    for i in range(maxIterations):
+        QNew=np.empty_like(Q)
+        for a in range(model.numberOfActions):
+            weighted=(model.observation(a)[:, :, None]*Q.T[:, None, :]).reshape(model.numberOfStates, -1)
+            projected=np.asarray(model.transition(a) @ weighted).reshape(model.numberOfStates, model.numberOfObservations, model.numberOfActions)
+            QNew[a]=model.rewardMatrix[a]+gamma*projected.max(axis=2).sum(axis=1)
+        change=np.abs(QNew-Q).max()
+        Q=QNew
+        if change < tolerance:
+            break
+    return Q
+
+
+def sawtooth(B, corners, points, values, chunkSize=2**22):
+    # Hauskrecht's interpolation: each point lowers the corner plane by its own slack, scaled by the
+    # largest multiple of the point that fits under b
+    bound=B @ corners
+    if len(points) == 0:
+        return bound
+    slack=np.minimum(values-points @ corners, 0)
+    support=points > 0
+    rowNumber=max(1, chunkSize//(len(points)*points.shape[1]))
+    for start in range(0, len(B), rowNumber):
+        chunk=B[start:start+rowNumber]
+        ratio=np.where(support[None], chunk[:, None, :]/np.where(support, points, 1)[None], np.inf).min(axis=2)
+        bound[start:start+rowNumber]+=(ratio*slack[None]).min(axis=1)
+    return bound
+
+
+class UpperBound(object):
+
+    def __init__(self, batchBeliefTransition, gamma, initialization='fib', tolerance=1e-6, maxSweeps=1000, decimals=10, capacity=16):
+        if initialization not in ('fib', 'qmdp'):
+            raise ValueError('unknown upper bound initialization %r' % (initialization,))
+        self.batchBeliefTransition=batchBeliefTransition
+        self.gamma=gamma
+        self.tolerance=tolerance
+        self.maxSweeps=maxSweeps
+        self.decimals=decimals
+        model=batchBeliefTransition.model
+        self.Q=fibValues(model, gamma) if initialization == 'fib' else qmdpValues(model, gamma)
+        self.corners=self.Q.max(axis=0)
+        self._points=np.empty((capacity, model.numberOfStates))
+        self._values=np.empty(capacity)
+        self.size=0
+        self.index={}
+
+    @property
+    def model(self):
+        return self.batchBeliefTransition.model
+
+    @property
+    def points(self):
+        return self._points[:self.size]
+
+    @property
+    def values(self):
+        return self._values[:self.size]
+
+    def __len__(self):
+        return self.size
+
+    def value(self, B):
+        B=self.model.beliefMatrix(B)
+        return np.minimum((B @ self.Q.T).max(axis=1), sawtooth(B, self.corners, self.points, self.values))
+
+    def lookahead(self, B, successors):
+        bPrime, normalizer, valid=successors
+        successorValues=np.zeros(valid.shape)
+        successorValues[valid]=self.value(bPrime[valid])
+        actionValues=B @ self.model.rewardMatrix.T+self.gamma*(normalizer*successorValues).sum(axis=2)
+        return actionValues, successorValues
+
+    def gap(self, V, B):
+        B=self.model.beliefMatrix(B)
+        alphaSet=toAlphaSet(V, self.model.stateSpace, self.model.actionSpace)
+        return self.value(B)-alphaSet.values(B).max(axis=1)
+
+    def sweep(self, B, successors):
+        backedUp=self.lookahead(B, successors)[0].max(axis=1)
+        improved=backedUp < self.value(B)-self.tolerance
+        for b, value in zip(B[improved], backedUp[improved]):
+            self.add(b, value)
+        return int(improved.sum())
+
+    def update(self, B, budget=None):
+        # sweep B until no point improves by more than tolerance; the successors do not change between sweeps
+        B=self.model.beliefMatrix(B)
+        successors=self.batchBeliefTransition(B)
+        improvedNumber=0
+        for i in range(self.maxSweeps):
+            if budget is not None and budget.exhausted():
+                break
+            improved=self.sweep(B, successors)
+            improvedNumber+=improved
+            if improved == 0:
+                break
+        return improvedNumber
+
+    def add(self, b, value):
+        s=b.argmax()
+        if b[s] == 1:
+            self.corners[s]=min(self.corners[s], value)
+            return
+        key=np.round(b, self.decimals).tobytes()
+        if key in self.index:
+            i=self.index[key]
+            self._values[i]=min(self._values[i], value)
+            return
+        if self.size == len(self._points):
+            self._points=np.vstack([self._points, np.empty_like(self._points)])
+            self._values=np.concatenate([self._values, np.empty_like(self._values)])
+        self._points[self.size]=b
+        self._values[self.size]=value
+        self.index[key]=self.size
+        self.size+=1
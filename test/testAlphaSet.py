@@ -0,0 +1,77 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+from alphaSet import AlphaSet
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestAlphaSet(unittest.TestCase):
+
+    def setUp(self):
+        self.V=[{'action':'listen', 'alpha':{'tiger-left':0.2, 'tiger-right':0.8}},
+                {'action':'open-left', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}]
+        self.alphaSet=AlphaSet.fromList(self.V, stateSpace, actionSpace)
+
+    def testRoundTrip(self):
+        self.assertEqual(len(self.alphaSet), 2)
+        self.assertEqual(list(self.alphaSet), self.V)
+
+    @data(({'action':'listen', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}, True),
+          ({'action':'listen', 'alpha':{'tiger-left':0.6, 'tiger-right':0.7}}, False))
+    @unpack
+    def testContains(self, alpha, expectedResult):
+        self.assertEqual(alpha in self.alphaSet, expectedResult)
+
+    def testDuplicatesRejected(self):
+        self.assertFalse(self.alphaSet.append({'action':'listen', 'alpha':{'tiger-left':0.2, 'tiger-right':0.8}}))
+        self.assertTrue(self.alphaSet.append({'action':'listen', 'alpha':{'tiger-left':0.1, 'tiger-right':0.8}}))
+        self.assertEqual(len(self.alphaSet), 3)
+
+    @data((3, 0.2000001, False), (10, 0.2000001, True))
+    @unpack
+    def testToleranceDuplicates(self, decimals, value, expectedResult):
+        alphaSet=AlphaSet.fromList(self.V, stateSpace, actionSpace, decimals)
+        self.assertEqual(alphaSet.add(np.array([value, 0.8]), 2), expectedResult)
+
+    def testGrowth(self):
+        alphaSet=AlphaSet(stateSpace, actionSpace, capacity=1)
+        added=alphaSet.extend(np.arange(20, dtype=float).reshape(10, 2), np.zeros(10, dtype=int))
+        self.assertEqual(added, 10)
+        np.testing.assert_array_equal(alphaSet.alphas, np.arange(20, dtype=float).reshape(10, 2))
+
+    @data(([[0.6, 0.4], [0.9, 0.1], [0, 1]], [1, 1, 0]))
+    @unpack
+    def testArgmax(self, B, expectedResult):
+        self.assertEqual(self.alphaSet.argmax(np.array(B[0])), expectedResult[0])
+        np.testing.assert_array_equal(self.alphaSet.argmax(np.array(B)), expectedResult)
+
+    @data(({'tiger-left':0.6, 'tiger-right':0.4}, {'action':'open-left', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}))
+    @unpack
+    def testArgmaxAlphaAndGetPolicy(self, b, expectedResult):
+        self.assertEqual(targetCode.argmaxAlpha(self.alphaSet, b), expectedResult)
+        self.assertEqual(targetCode.GetPolicy(targetCode.argmaxAlpha)(self.alphaSet, b), expectedResult['action'])
+
+    def testImproveWithAlphaSet(self):
+        transitionFunction=TigerTransition()
+        observationFunction=TigerObservation(observationParam)
+        gamma=0.5
+        beliefTransition=targetCode.BeliefTransition(transitionFunction, observationFunction)
+        getBetaAO=targetCode.GetBetaAO(beliefTransition, targetCode.argmaxAlpha)
+        getBetaA=targetCode.GetBetaA(getBetaAO, transitionFunction, TigerReward(rewardParam), observationFunction, stateSpace, observationSpace, gamma, 5)
+        improve=targetCode.Improve(targetCode.Backup(getBetaA, targetCode.argmaxAlpha, stateSpace, actionSpace))
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        B=[{'tiger-left':0.5, 'tiger-right':0.5}, {'tiger-left':0.85, 'tiger-right':0.15}]
+        expectedResult=improve(V, B)
+        calculatedResult=improve(AlphaSet.fromList(V, stateSpace, actionSpace), B)
+        self.assertIsInstance(calculatedResult, AlphaSet)
+        for b in B:
+            self.assertEqual(targetCode.argmaxAlpha(calculatedResult, b), targetCode.argmaxAlpha(expectedResult, b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import PBVI as targetCode
+from batchBeliefTransition import BatchBeliefTransition
+from budget import Budget
+from compiledModel import compileModel
+from matrixBackup import MatrixBackup
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+class FakeClock(object):
+
+    def __init__(self, step):
+        self.step=step
+        self.time=0.0
+
+    def __call__(self):
+        self.time+=self.step
+        return self.time
+
+
+@ddt
+class TestAnytime(unittest.TestCase):
+
+    def setUp(self):
+        self.model=compileModel(TigerTransition(), TigerObservation(observationParam), TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        self.gamma=0.95
+        self.V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-self.gamma) for s in stateSpace}}]
+        self.b0={'tiger-left':0.5, 'tiger-right':0.5}
+        self.expand=targetCode.IndexedExpand(BatchBeliefTransition(self.model))
+        self.getPolicy=targetCode.GetPolicy(targetCode.argmaxAlpha)
+
+    def makeImprove(self, maxIterations=None, budget=None):
+        return targetCode.BatchImprove(MatrixBackup(self.model, self.gamma, 5), maxIterations=maxIterations, budget=budget)
+
+    @data((1, 1), (3, 3))
+    @unpack
+    def testImproveMaxIterations(self, maxIterations, expectedResult):
+        calls=[]
+        backup=MatrixBackup(self.model, self.gamma, 5)
+        def countingBackup(V, B):
+            calls.append(len(V))
+            return backup(V, B)
+        countingBackup.model=self.model
+        targetCode.BatchImprove(countingBackup, maxIterations=maxIterations)(self.V, [self.b0])
+        self.assertEqual(len(calls), expectedResult)
+
+    def testTimeBudget(self):
+        budget=Budget(10, FakeClock(1))
+        pbvi=targetCode.PBVI(self.makeImprove(budget=budget), self.expand, self.getPolicy, self.V, None, budget=budget)
+        policy=pbvi.solve(self.b0)
+        self.assertEqual(policy.metadata['stopReason'], 'budget')
+        self.assertGreaterEqual(policy.metadata['iterations'], 1)
+        self.assertGreater(len(policy.alphaSet), 1)
+
+    @data('list', 'batch')
+    def testStandaloneImproveBudget(self, pipeline):
+        calls=[]
+        backup=MatrixBackup(self.model, self.gamma, 5)
+        def countingBackup(V, B):
+            calls.append(len(V))
+            return backup(V, B)
+        countingBackup.model=self.model
+        budget=Budget(5, FakeClock(1))
+        if pipeline == 'batch':
+            targetCode.BatchImprove(countingBackup, budget=budget)(self.V, [self.b0])
+        else:
+            targetCode.Improve(lambda V, b: countingBackup(V, [b])[0], budget=budget)(self.V, [self.b0])
+        self.assertEqual(len(calls), 4)
+
+    def testTolerance(self):
+        pbvi=targetCode.PBVI(self.makeImprove(), self.expand, self.getPolicy, self.V, 50, tolerance=1e-3)
+        policy=pbvi.solve(self.b0)
+        self.assertEqual(policy.metadata['stopReason'], 'tolerance')
+        self.assertLess(policy.metadata['iterations'], 50)
+
+    @data(('improve', 2, 'callback'), ('expand', 1, 'callback'))
+    @unpack
+    def testCallbackStops(self, phase, stopIteration, expectedResult):
+        steps=[]
+        def callback(calledPhase, iteration, V, B):
+            steps.append((calledPhase, iteration))
+            return calledPhase == phase and iteration == stopIteration
+        pbvi=targetCode.PBVI(self.makeImprove(), self.expand, self.getPolicy, self.V, 10, callback=callback)
+        policy=pbvi.solve(self.b0)
+        self.assertEqual(policy.metadata['stopReason'], expectedResult)
+        self.assertEqual(steps[-1], (phase, stopIteration))
+
+    def testInterruptReturnsBestSoFar(self):
+        def callback(phase, iteration, V, B):
+            if iteration == 2:
+                raise KeyboardInterrupt
+        pbvi=targetCode.PBVI(self.makeImprove(), self.expand, self.getPolicy, self.V, 10, callback=callback)
+        policy=pbvi.solve(self.b0)
+        self.assertEqual(policy.metadata['stopReason'], 'interrupted')
+        self.assertEqual(policy.metadata['iterations'], 3)
+        self.assertEqual(policy.action(self.b0), 'listen')
+
+
+if __name__ == '__main__':
+    unittest.main()
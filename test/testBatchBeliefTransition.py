@@ -0,0 +1,66 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+from compiledModel import compileModel
+from batchBeliefTransition import BatchBeliefTransition
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestBatchBeliefTransition(unittest.TestCase):
+
+    def setUp(self):
+        self.transitionFunction=TigerTransition()
+        self.observationFunction=TigerObservation(observationParam)
+        self.model=compileModel(self.transitionFunction, self.observationFunction, TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        self.batchBeliefTransition=BatchBeliefTransition(self.model)
+
+    @data(([{'tiger-left': 0.15, 'tiger-right': 0.85}, {'tiger-left': 1, 'tiger-right': 0}, {'tiger-left': 0.5, 'tiger-right': 0.5}],))
+    @unpack
+    def testMatchesBeliefTransition(self, B):
+        beliefTransition=targetCode.BeliefTransition(self.transitionFunction, self.observationFunction)
+        bPrime, normalizer, valid=self.batchBeliefTransition(B)
+        self.assertEqual(bPrime.shape, (len(B), len(actionSpace), len(observationSpace), len(stateSpace)))
+        for n, b in enumerate(B):
+            for i, a in enumerate(actionSpace):
+                for j, o in enumerate(observationSpace):
+                    expectedResult=beliefTransition(b, a, o)
+                    self.assertEqual(valid[n, i, j], expectedResult != {})
+                    if expectedResult != {}:
+                        np.testing.assert_allclose(bPrime[n, i, j], self.model.beliefVector(expectedResult))
+
+    @data(({'tiger-left': 0.15, 'tiger-right': 0.85}, 'listen', 'Nothing'))
+    @unpack
+    def testZeroProbabilityObservationMasked(self, b, a, o):
+        bPrime, normalizer, valid=self.batchBeliefTransition([b])
+        i, j=self.model.actionIndex[a], self.model.observationIndex[o]
+        self.assertFalse(valid[0, i, j])
+        self.assertEqual(normalizer[0, i, j], 0)
+        np.testing.assert_array_equal(bPrime[0, i, j], np.zeros(len(stateSpace)))
+
+    @data(({'tiger-left': 0.5, 'tiger-right': 0.5}, 'listen', [0.5, 0.5, 0]))
+    @unpack
+    def testNormalizerIsObservationProbability(self, b, a, expectedResult):
+        bPrime, normalizer, valid=self.batchBeliefTransition([b])
+        np.testing.assert_allclose(normalizer[0, self.model.actionIndex[a]], expectedResult)
+
+    @data(([{'tiger-left': 0.15, 'tiger-right': 0.85}, {'tiger-left': 0.6, 'tiger-right': 0.4}],))
+    @unpack
+    def testBatchExpandMatchesExpand(self, B):
+        beliefTransition=targetCode.BeliefTransition(self.transitionFunction, self.observationFunction)
+        expand=targetCode.Expand(beliefTransition, actionSpace, observationSpace, targetCode.furthestB)
+        batchExpand=targetCode.BatchExpand(self.batchBeliefTransition, targetCode.furthestB)
+        expectedResult=expand(B)
+        calculatedResult=batchExpand(B)
+        self.assertEqual(len(calculatedResult), len(expectedResult))
+        for calculatedBelief, expectedBelief in zip(calculatedResult, expectedResult):
+            for s in stateSpace:
+                self.assertAlmostEqual(calculatedBelief[s], expectedBelief[s])
+
+
+if __name__ == '__main__':
+    unittest.main()
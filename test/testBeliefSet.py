@@ -0,0 +1,82 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+import beliefSet
+from beliefSet import BeliefSet
+from batchBeliefTransition import BatchBeliefTransition
+from compiledModel import compileModel
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestBeliefSet(unittest.TestCase):
+
+    @data(([[2, 5], [4, 9]], [[1, 7], [5, 8]], [3, 2], 0))
+    @unpack
+    def testFurthestMatchesFurthestB(self, successors, B, expectedDistance, expectedIndex):
+        beliefSet=BeliefSet(2)
+        beliefSet.extend(np.array(B, dtype=float))
+        np.testing.assert_allclose(beliefSet.minDistance(np.array(successors, dtype=float)), expectedDistance)
+        self.assertEqual(beliefSet.furthest(np.array(successors, dtype=float))[0], expectedIndex)
+
+    @data((0.0, 3), (0.05, 2))
+    @unpack
+    def testDeduplication(self, tolerance, expectedSize):
+        beliefSet=BeliefSet(2, tolerance)
+        added=beliefSet.extend(np.array([[0.5, 0.5], [0.5, 0.5], [0.52, 0.48], [1, 0]]))
+        self.assertEqual(added, expectedSize)
+        self.assertEqual(len(beliefSet), expectedSize)
+
+    @unittest.skipIf(beliefSet.cKDTree is None, 'the tree index needs scipy')
+    @data((3, 40), (7, 400))
+    @unpack
+    def testTreeMatchesBruteForce(self, numberOfStates, numberOfBeliefs):
+        random=np.random.RandomState(0)
+        B=random.dirichlet(np.ones(numberOfStates), numberOfBeliefs)
+        candidates=random.dirichlet(np.ones(numberOfStates), 50)
+        indexed=BeliefSet(numberOfStates, treeThreshold=8)
+        indexed.extend(B)
+        self.assertIsNotNone(indexed._tree)
+        self.assertLess(indexed._treeSize, len(indexed))
+        expectedResult=np.abs(candidates[:, None, :]-B[None, :, :]).sum(axis=2).min(axis=1)
+        np.testing.assert_allclose(indexed.minDistance(candidates), expectedResult)
+
+    @unittest.skipIf(beliefSet.cKDTree is None, 'the tree index needs scipy')
+    @data((3, 40), (50, 4000))
+    @unpack
+    def testLoadMatchesExtend(self, numberOfStates, numberOfBeliefs):
+        random=np.random.RandomState(0)
+        B=random.dirichlet(np.ones(numberOfStates), numberOfBeliefs)
+        candidates=random.dirichlet(np.ones(numberOfStates), 50)
+        loaded=BeliefSet(numberOfStates, treeThreshold=8)
+        self.assertEqual(loaded.load(B[:-10]), numberOfBeliefs-10)
+        self.assertEqual(loaded._treeSize, numberOfBeliefs-10)
+        loaded.extend(B[-10:])
+        self.assertEqual(len(loaded), numberOfBeliefs)
+        expectedResult=np.abs(candidates[:, None, :]-B[None, :, :]).sum(axis=2).min(axis=1)
+        np.testing.assert_allclose(loaded.minDistance(candidates), expectedResult)
+
+    def testIndexedExpandMatchesExpand(self):
+        transitionFunction=TigerTransition()
+        observationFunction=TigerObservation(observationParam)
+        model=compileModel(transitionFunction, observationFunction, TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        beliefTransition=targetCode.BeliefTransition(transitionFunction, observationFunction)
+        expand=targetCode.Expand(beliefTransition, actionSpace, observationSpace, targetCode.furthestB)
+        indexedExpand=targetCode.IndexedExpand(BatchBeliefTransition(model))
+        B=[{'tiger-left':0.3, 'tiger-right':0.7}, {'tiger-left':0.9, 'tiger-right':0.1}]
+        expectedResult=expand(B)
+        calculatedResult=indexedExpand(B)
+        self.assertEqual(len(calculatedResult), len(expectedResult))
+        for calculatedBelief, expectedBelief in zip(calculatedResult, expectedResult):
+            for s in stateSpace:
+                self.assertAlmostEqual(calculatedBelief[s], expectedBelief[s])
+        calculatedMatrix=indexedExpand(model.beliefMatrix(B))
+        np.testing.assert_allclose(calculatedMatrix, model.beliefMatrix(calculatedResult))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+from alphaSet import AlphaSet
+from batchBeliefTransition import BatchBeliefTransition
+import compiledModel
+from compiledModel import CompiledModel, compileModel
+from matrixBackup import MatrixBackup
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestCompiledModel(unittest.TestCase):
+
+    def setUp(self):
+        self.rewardFunction=TigerReward(rewardParam)
+        self.observationFunction=TigerObservation(observationParam)
+        self.transitionFunction=TigerTransition()
+        self.model=compileModel(self.transitionFunction, self.observationFunction, self.rewardFunction, stateSpace, actionSpace, observationSpace)
+        self.gamma=1
+        self.roundingTolerance=5
+
+    def testShapes(self):
+        self.assertEqual(self.model.transitionMatrix.shape, (3, 2, 2))
+        self.assertEqual(self.model.observationMatrix.shape, (3, 2, 3))
+        self.assertEqual(self.model.rewardMatrix.shape, (3, 2))
+
+    @data(('tiger-left', 'listen', 'tiger-left'), ('tiger-left', 'open-left', 'tiger-right'), ('tiger-right', 'listen', 'tiger-left'))
+    @unpack
+    def testLookupsMatchCallables(self, s, a, sPrime):
+        self.assertEqual(self.model.transitionFunction(s, a, sPrime), self.transitionFunction(s, a, sPrime))
+        self.assertEqual(self.model.rewardFunction(s, a, sPrime), self.rewardFunction(s, a, sPrime))
+        for o in observationSpace:
+            self.assertEqual(self.model.observationFunction(sPrime, a, o), self.observationFunction(sPrime, a, o))
+
+    @data(({'tiger-left': 0.25, 'tiger-right': 0.75}, [0.25, 0.75]))
+    @unpack
+    def testBeliefRoundTrip(self, b, expectedResult):
+        vector=self.model.beliefVector(b)
+        np.testing.assert_allclose(vector, expectedResult)
+        self.assertDictEqual(self.model.belief(vector), b)
+
+    @data(([{'action':'listen', 'alpha':{'tiger-left':0.2, 'tiger-right':0.8}},
+            {'action':'listen', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}],
+            {'tiger-left':0.95, 'tiger-right':0.05},
+            {'action':'open-right', 'alpha':{'tiger-left':10.7, 'tiger-right':-99.3}}))
+    @unpack
+    def testBackupWithCompiledModel(self, V, b, expectedResult):
+        beliefTransition=targetCode.BeliefTransition(self.model.transitionFunction, self.model.observationFunction)
+        getBetaAO=targetCode.GetBetaAO(beliefTransition, targetCode.argmaxAlpha)
+        getBetaA=targetCode.GetBetaA(getBetaAO, self.model.transitionFunction, self.model.rewardFunction,
+                                     self.model.observationFunction, self.model.stateSpace, self.model.observationSpace, self.gamma, self.roundingTolerance)
+        backup=targetCode.Backup(getBetaA, targetCode.argmaxAlpha, self.model.stateSpace, self.model.actionSpace)
+        calculatedResult=backup(V, b)
+        self.assertEqual(calculatedResult['action'], expectedResult['action'])
+        for s in expectedResult['alpha']:
+            self.assertAlmostEqual(calculatedResult['alpha'][s], expectedResult['alpha'][s])
+
+    def makeSparseProblem(self, numberOfStates, numberOfActions, numberOfObservations, successorNumber):
+        random=np.random.RandomState(2)
+        transitionMatrix=np.zeros((numberOfActions, numberOfStates, numberOfStates))
+        observationMatrix=np.zeros((numberOfActions, numberOfStates, numberOfObservations))
+        for a in range(numberOfActions):
+            for s in range(numberOfStates):
+                successors=random.choice(numberOfStates, successorNumber, replace=False)
+                transitionMatrix[a, s, successors]=random.dirichlet(np.ones(successorNumber))
+                observations=random.choice(numberOfObservations, 2, replace=False)
+                observationMatrix[a, s, observations]=random.dirichlet(np.ones(2))
+        rewardMatrix=random.uniform(-1, 1, (numberOfActions, numberOfStates))
+        return transitionMatrix, observationMatrix, rewardMatrix
+
+    @data((None, False), (0.1, True), (0.01, False))
+    @unpack
+    def testAutomaticStorage(self, densityThreshold, expectedResult):
+        if expectedResult and compiledModel.sparse is None:
+            self.skipTest('sparse storage needs scipy')
+        transitionMatrix, observationMatrix, rewardMatrix=self.makeSparseProblem(40, 2, 30, 2)
+        model=CompiledModel(range(40), range(2), range(30), transitionMatrix, observationMatrix, rewardMatrix, densityThreshold)
+        self.assertEqual(model.isSparse, expectedResult)
+        self.assertFalse(CompiledModel(range(40), range(2), range(30), model.transitionMatrix, model.observationMatrix, rewardMatrix, None).isSparse)
+        self.assertEqual(model.transitionFunction(3, 1, 7), transitionMatrix[1, 3, 7])
+        self.assertEqual(model.observationFunction(3, 1, 7), observationMatrix[1, 3, 7])
+
+    @unittest.skipIf(compiledModel.sparse is None, 'sparse storage needs scipy')
+    def testSparseKernelsMatchDense(self):
+        transitionMatrix, observationMatrix, rewardMatrix=self.makeSparseProblem(50, 3, 4, 3)
+        denseModel=CompiledModel(range(50), range(3), range(4), transitionMatrix, observationMatrix, rewardMatrix, None)
+        sparseModel=CompiledModel(range(50), range(3), range(4), transitionMatrix, observationMatrix, rewardMatrix, 1.0)
+        self.assertTrue(sparseModel.isSparse)
+        random=np.random.RandomState(3)
+        B=random.dirichlet(np.ones(50), 10)
+        for calculatedResult, expectedResult in zip(BatchBeliefTransition(sparseModel)(B), BatchBeliefTransition(denseModel)(B)):
+            np.testing.assert_allclose(calculatedResult, expectedResult)
+        V=AlphaSet(range(50), range(3))
+        V.extend(random.uniform(-5, 5, (6, 50)), random.randint(3, size=6))
+        calculatedResult=MatrixBackup(sparseModel, 0.9, 8)(V, B)
+        expectedResult=MatrixBackup(denseModel, 0.9, 8)(V, B)
+        np.testing.assert_allclose(calculatedResult.alphas, expectedResult.alphas)
+        np.testing.assert_array_equal(calculatedResult.actions, expectedResult.actions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import domains
+from compiledModel import compileModel
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestDomains(unittest.TestCase):
+
+    @data(('tiger', {}, 2, 3, 3), ('hallway', {'length': 4}, 24, 5, None), ('tag', {'width': 3, 'height': 3}, 82, 5, 19),
+          ('rockSample', {'size': 4, 'rockNumber': 2}, 65, 7, 3))
+    @unpack
+    def testModelIsStochastic(self, domain, parameters, numberOfStates, numberOfActions, numberOfObservations):
+        model=getattr(domains, domain)(**parameters)
+        self.assertEqual(model.numberOfStates, numberOfStates)
+        self.assertEqual(model.numberOfActions, numberOfActions)
+        if numberOfObservations is not None:
+            self.assertEqual(model.numberOfObservations, numberOfObservations)
+        for a in range(model.numberOfActions):
+            np.testing.assert_allclose(np.asarray(model.transition(a).sum(axis=1)).ravel(), np.ones(numberOfStates))
+            np.testing.assert_allclose(model.observation(a).sum(axis=1), np.ones(numberOfStates))
+        self.assertAlmostEqual(domains.initialBelief(model, domain).sum(), 1)
+
+    def testTigerMatchesCallables(self):
+        expectedResult=compileModel(TigerTransition(), TigerObservation(observationParam), TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        calculatedResult=domains.tiger()
+        np.testing.assert_allclose(calculatedResult.transitionMatrix, expectedResult.transitionMatrix)
+        np.testing.assert_allclose(calculatedResult.observationMatrix, expectedResult.observationMatrix)
+        np.testing.assert_allclose(calculatedResult.rewardMatrix, expectedResult.rewardMatrix)
+
+    @unittest.skipIf(domains.sparse is None, 'sparse storage needs scipy')
+    def testRockSampleIsSparse(self):
+        model=domains.rockSample(5, 3)
+        self.assertTrue(model.isSparse)
+        self.assertEqual(model.numberOfStates, 25*8+1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+from batchBeliefTransition import BatchBeliefTransition
+from compiledModel import compileModel
+from expansion import RandomActionExpand, GreedyErrorReductionExpand, BudgetedExpand
+from matrixBackup import MatrixBackup
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestExpansion(unittest.TestCase):
+
+    def setUp(self):
+        self.model=compileModel(TigerTransition(), TigerObservation(observationParam), TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        self.batchBeliefTransition=BatchBeliefTransition(self.model)
+        self.gamma=0.5
+        self.V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-self.gamma) for s in stateSpace}}]
+        self.B=[{'tiger-left':0.5, 'tiger-right':0.5}, {'tiger-left':0.85, 'tiger-right':0.15}, {'tiger-left':0.15, 'tiger-right':0.85}]
+
+    def makeExpand(self, strategy, budget):
+        if strategy == 'random':
+            return RandomActionExpand(self.batchBeliefTransition, budget, seed=0)
+        if strategy == 'greedy':
+            return GreedyErrorReductionExpand(self.batchBeliefTransition, self.gamma, budget)
+        return BudgetedExpand(self.batchBeliefTransition, budget)
+
+    @data(('random', None), ('random', 1), ('greedy', None), ('greedy', 1), ('budgeted', 1), ('budgeted', 2))
+    @unpack
+    def testBudgetBoundsGrowth(self, strategy, budget):
+        BNew=self.makeExpand(strategy, budget)(self.B, self.V)
+        self.assertEqual(BNew[:len(self.B)], self.B)
+        self.assertLessEqual(len(BNew)-len(self.B), len(self.B) if budget is None else budget)
+        for b in BNew:
+            self.assertAlmostEqual(sum(b.values()), 1)
+        Bmatrix=self.model.beliefMatrix(BNew)
+        self.assertEqual(len(np.unique(Bmatrix.round(12), axis=0)), len(BNew))
+
+    def testBudgetedPicksFurthest(self):
+        BNew=BudgetedExpand(self.batchBeliefTransition, 1)([{'tiger-left':0.5, 'tiger-right':0.5}])
+        self.assertEqual(len(BNew), 2)
+        self.assertAlmostEqual(abs(BNew[1]['tiger-left']-0.5), 0.35)
+
+    def testGreedyNeedsV(self):
+        with self.assertRaises(ValueError):
+            GreedyErrorReductionExpand(self.batchBeliefTransition, self.gamma)(self.B)
+
+    def testMatrixBeliefs(self):
+        BNew=self.makeExpand('budgeted', 2)(self.model.beliefMatrix(self.B))
+        self.assertIsInstance(BNew, np.ndarray)
+        self.assertEqual(BNew.shape, (5, 2))
+
+    @data('random', 'greedy', 'budgeted')
+    def testSolveWithStrategy(self, strategy):
+        improve=targetCode.BatchImprove(MatrixBackup(self.model, self.gamma, 5))
+        pbvi=targetCode.PBVI(improve, self.makeExpand(strategy, 2), targetCode.GetPolicy(targetCode.argmaxAlpha), self.V, 4)
+        policy=pbvi.solve({'tiger-left':0.5, 'tiger-right':0.5})
+        self.assertLessEqual(len(policy.B), 1+2*4)
+        self.assertEqual(policy.action({'tiger-left':0.5, 'tiger-right':0.5}), 'listen')
+
+
+if __name__ == '__main__':
+    unittest.main()
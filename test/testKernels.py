@@ -0,0 +1,132 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from unittest import mock
+from ddt import ddt, data
+import numpy as np
+import domains
+import kernels
+import PBVI as targetCode
+from alphaSet import AlphaSet
+from batchBeliefTransition import BatchBeliefTransition
+from beliefSet import BeliefSet
+from expansion import RandomActionExpand, GreedyErrorReductionExpand, BudgetedExpand
+from compiledModel import compileModel
+from matrixBackup import MatrixBackup
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.random=np.random.RandomState(0)
+
+    @data(*kernels.availableBackends())
+    def testBackupPointsMatchesReference(self, backend):
+        gammaAO=self.random.normal(size=(3, 4, 7, 5))
+        B=self.random.dirichlet(np.ones(5), size=11)
+        rewardMatrix=self.random.normal(size=(3, 5))
+        expectedResult=kernels.backupPointsNumpy(gammaAO, B, rewardMatrix, 0.9)
+        calculatedResult=kernels.getKernels(backend).backupPoints(gammaAO, B, rewardMatrix, 0.9)
+        np.testing.assert_allclose(calculatedResult, expectedResult, atol=1e-12)
+
+    @data(*kernels.availableBackends())
+    def testNearestL1MatchesReference(self, backend):
+        candidates=self.random.dirichlet(np.ones(6), size=40)
+        beliefs=np.vstack([self.random.dirichlet(np.ones(6), size=25), candidates[:3]])
+        expectedDistance, expectedIndex=kernels.nearestL1Numpy(candidates, beliefs)
+        calculatedDistance, calculatedIndex=kernels.getKernels(backend).nearestL1(candidates, beliefs)
+        np.testing.assert_allclose(calculatedDistance, expectedDistance, atol=1e-12)
+        np.testing.assert_array_equal(calculatedIndex, expectedIndex)
+
+    @data(*kernels.availableBackends())
+    def testTigerMatchesListPipeline(self, backend):
+        # the dict-based Improve/Backup in PBVI.py stay the reference for every backend
+        gamma=0.5
+        transitionFunction=TigerTransition()
+        observationFunction=TigerObservation(observationParam)
+        rewardFunction=TigerReward(rewardParam)
+        beliefTransition=targetCode.BeliefTransition(transitionFunction, observationFunction)
+        getBetaAO=targetCode.GetBetaAO(beliefTransition, targetCode.argmaxAlpha)
+        getBetaA=targetCode.GetBetaA(getBetaAO, transitionFunction, rewardFunction, observationFunction, stateSpace, observationSpace, gamma, 5)
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        B=[{'tiger-left':0.05*n, 'tiger-right':1-0.05*n} for n in range(21)]
+        expectedResult=targetCode.Improve(targetCode.Backup(getBetaA, targetCode.argmaxAlpha, stateSpace, actionSpace))(V, B)
+        model=compileModel(transitionFunction, observationFunction, rewardFunction, stateSpace, actionSpace, observationSpace)
+        calculatedResult=targetCode.BatchImprove(MatrixBackup(model, gamma, 5, backend=backend))(V, B)
+        for b in B:
+            expectedAlpha=targetCode.argmaxAlpha(expectedResult, b)
+            calculatedAlpha=targetCode.argmaxAlpha(calculatedResult, b)
+            self.assertEqual(calculatedAlpha['action'], expectedAlpha['action'])
+            for s in stateSpace:
+                self.assertAlmostEqual(calculatedAlpha['alpha'][s], expectedAlpha['alpha'][s], places=4)
+
+    @data(*kernels.availableBackends())
+    def testSolveMatchesAcrossBackends(self, backend):
+        model=domains.rockSample(4, 2)
+        B=BatchBeliefTransition(model)(domains.initialBelief(model, 'rockSample')[None])[0].reshape(-1, model.numberOfStates)
+        B=B[B.sum(axis=1) > 0]
+        V=AlphaSet(model.stateSpace, model.actionSpace)
+        V.add(np.full(model.numberOfStates, model.rewardMatrix.min()/(1-0.95)), 0)
+        expectedResult=targetCode.BatchImprove(MatrixBackup(model, 0.95, 8), maxIterations=10)(V, B)
+        calculatedResult=targetCode.BatchImprove(MatrixBackup(model, 0.95, 8, backend=backend), maxIterations=10)(V, B)
+        np.testing.assert_allclose(calculatedResult.alphas, expectedResult.alphas, atol=1e-6)
+        np.testing.assert_array_equal(calculatedResult.actions, expectedResult.actions)
+
+    @data(*kernels.availableBackends())
+    def testBeliefSetMatchesReference(self, backend):
+        B=self.random.dirichlet(np.ones(4), size=60)
+        candidates=self.random.dirichlet(np.ones(4), size=30)
+        beliefSet=BeliefSet(4, treeThreshold=16, backend=backend)
+        beliefSet.load(B[:20])
+        beliefSet.extend(B[20:])
+        self.assertEqual(beliefSet.kernels.name, backend)
+        expectedResult=np.abs(candidates[:, None, :]-B[None, :, :]).sum(axis=2).min(axis=1)
+        np.testing.assert_allclose(beliefSet.minDistance(candidates), expectedResult)
+
+    @data(*kernels.availableBackends())
+    def testExpandMatchesAcrossBackends(self, backend):
+        # symmetric domains such as hallway have exact distance ties, which the two summation orders can break differently
+        model=domains.rockSample(4, 2)
+        batchBeliefTransition=BatchBeliefTransition(model)
+        B=domains.initialBelief(model, 'rockSample')[None]
+        V=AlphaSet(model.stateSpace, model.actionSpace)
+        V.add(np.zeros(model.numberOfStates), 0)
+        for i in range(3):
+            B=targetCode.IndexedExpand(batchBeliefTransition)(B)
+        for makeExpand in (lambda backend: targetCode.IndexedExpand(batchBeliefTransition, backend=backend),
+                           lambda backend: RandomActionExpand(batchBeliefTransition, 3, seed=0, backend=backend),
+                           lambda backend: GreedyErrorReductionExpand(batchBeliefTransition, 0.95, 3, backend=backend),
+                           lambda backend: BudgetedExpand(batchBeliefTransition, 3, backend=backend)):
+            np.testing.assert_allclose(makeExpand(backend)(B, V), makeExpand('numpy')(B, V))
+
+    @data(*kernels.availableBackends())
+    def testKernelFurthestBConvertsBOncePerRound(self, backend):
+        furthestB=targetCode.KernelFurthestB(backend)
+        B=[{'tiger-left':0.5, 'tiger-right':0.5}, {'tiger-left':0.15, 'tiger-right':0.85}]
+        successors=[{'tiger-left':0.6, 'tiger-right':0.4}, {'tiger-left':0.9, 'tiger-right':0.1}]
+        self.assertEqual(furthestB(successors, B), successors[1])
+        Bmatrix=furthestB._Bmatrix
+        furthestB(successors[:1], B)
+        self.assertIs(furthestB._Bmatrix, Bmatrix)
+        B.append({'tiger-left':0.9, 'tiger-right':0.1})
+        self.assertEqual(furthestB(successors, B), successors[0])
+
+    def testUnknownBackend(self):
+        with self.assertRaises(ValueError):
+            kernels.getKernels('cuda')
+        self.assertIn(kernels.getKernels('auto').name, kernels.availableBackends())
+
+    def testAutoFallsBackWithoutNumbaBackend(self):
+        # numbaKernels is None whenever numba or scipy is missing
+        with mock.patch.object(kernels, 'numbaKernels', None):
+            self.assertEqual(kernels.availableBackends(), ['numpy'])
+            self.assertEqual(kernels.getKernels('auto').name, 'numpy')
+            with self.assertRaises(ImportError):
+                kernels.getKernels('numba')
+
+
+if __name__ == '__main__':
+    unittest.main()
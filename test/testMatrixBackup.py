@@ -0,0 +1,93 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+from alphaSet import AlphaSet
+from compiledModel import CompiledModel, compileModel
+from matrixBackup import MatrixBackup
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestMatrixBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.transitionFunction=TigerTransition()
+        self.observationFunction=TigerObservation(observationParam)
+        self.rewardFunction=TigerReward(rewardParam)
+        self.model=compileModel(self.transitionFunction, self.observationFunction, self.rewardFunction, stateSpace, actionSpace, observationSpace)
+        self.roundingTolerance=5
+
+    def makeBackup(self, gamma):
+        beliefTransition=targetCode.BeliefTransition(self.transitionFunction, self.observationFunction)
+        getBetaAO=targetCode.GetBetaAO(beliefTransition, targetCode.argmaxAlpha)
+        getBetaA=targetCode.GetBetaA(getBetaAO, self.transitionFunction, self.rewardFunction,
+                                     self.observationFunction, stateSpace, observationSpace, gamma, self.roundingTolerance)
+        return targetCode.Backup(getBetaA, targetCode.argmaxAlpha, stateSpace, actionSpace)
+
+    @data(([{'action':'listen', 'alpha':{'tiger-left':0.2, 'tiger-right':0.8}},
+            {'action':'listen', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}],
+            [{'tiger-left':0.95, 'tiger-right':0.05}, {'tiger-left':0.4, 'tiger-right':0.6}],
+            [{'action':'open-right', 'alpha':{'tiger-left':10.7, 'tiger-right':-99.3}},
+             {'action':'listen', 'alpha':{'tiger-left':-0.4, 'tiger-right':-0.2}}]))
+    @unpack
+    def testBackupAllPoints(self, V, B, expectedResult):
+        calculatedResult=MatrixBackup(self.model, 1, self.roundingTolerance)(V, B)
+        self.assertEqual(len(calculatedResult), len(expectedResult))
+        for calculatedAlpha, expectedAlpha in zip(calculatedResult, expectedResult):
+            self.assertEqual(calculatedAlpha['action'], expectedAlpha['action'])
+            for s in stateSpace:
+                self.assertAlmostEqual(calculatedAlpha['alpha'][s], expectedAlpha['alpha'][s])
+
+    @data(([{'action':'listen', 'alpha':{'tiger-left':0.2, 'tiger-right':0.8}},
+            {'action':'listen', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}],
+            [{'tiger-left':0.05*n, 'tiger-right':1-0.05*n} for n in range(21)]))
+    @unpack
+    def testMatchesPointBackup(self, V, B):
+        backup=self.makeBackup(0.5)
+        calculatedResult=MatrixBackup(self.model, 0.5, self.roundingTolerance)(V, B)
+        for b, calculatedAlpha in zip(B, calculatedResult):
+            expectedAlpha=backup(V, b)
+            self.assertEqual(calculatedAlpha['action'], expectedAlpha['action'])
+            for s in stateSpace:
+                self.assertAlmostEqual(calculatedAlpha['alpha'][s], expectedAlpha['alpha'][s])
+
+    @data((2, 97), (4, 97), (8, 3))
+    @unpack
+    def testParallelMatchesSerial(self, workerNumber, numberOfBeliefs):
+        random=np.random.RandomState(1)
+        numberOfStates, numberOfActions, numberOfObservations=6, 3, 4
+        transitionMatrix=random.dirichlet(np.ones(numberOfStates), (numberOfActions, numberOfStates))
+        observationMatrix=random.dirichlet(np.ones(numberOfObservations), (numberOfActions, numberOfStates))
+        rewardMatrix=random.uniform(-10, 10, (numberOfActions, numberOfStates))
+        model=CompiledModel(range(numberOfStates), range(numberOfActions), range(numberOfObservations), transitionMatrix, observationMatrix, rewardMatrix)
+        V=AlphaSet(model.stateSpace, model.actionSpace)
+        V.extend(random.uniform(-20, 20, (20, numberOfStates)), random.randint(numberOfActions, size=20))
+        B=random.dirichlet(np.ones(numberOfStates), numberOfBeliefs)
+        expectedResult=MatrixBackup(model, 0.9, self.roundingTolerance)(V, B)
+        parallelBackup=MatrixBackup(model, 0.9, self.roundingTolerance, workerNumber)
+        calculatedResult=parallelBackup(V, B)
+        parallelBackup.close()
+        np.testing.assert_array_equal(calculatedResult.alphas, expectedResult.alphas)
+        np.testing.assert_array_equal(calculatedResult.actions, expectedResult.actions)
+
+    @data(({'tiger-left':0.5, 'tiger-right':0.5},))
+    @unpack
+    def testBatchImproveMatchesImprove(self, b0):
+        gamma=0.5
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        B=[b0, {'tiger-left':0.85, 'tiger-right':0.15}, {'tiger-left':0.15, 'tiger-right':0.85}]
+        expectedResult=targetCode.Improve(self.makeBackup(gamma))(V, B)
+        calculatedResult=targetCode.BatchImprove(MatrixBackup(self.model, gamma, self.roundingTolerance))(V, B)
+        expectedValues=[targetCode.argmaxAlpha(expectedResult, b)['alpha'] for b in B]
+        calculatedValues=[targetCode.argmaxAlpha(calculatedResult, b)['alpha'] for b in B]
+        for calculatedAlpha, expectedAlpha in zip(calculatedValues, expectedValues):
+            for s in stateSpace:
+                self.assertAlmostEqual(calculatedAlpha[s], expectedAlpha[s], places=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ sys.path.append('../src/')
 import unittest
 from ddt import ddt, data, unpack
 import PBVI as targetCode
+import kernels
 
 class TigerTransition():
     def __init__(self):
@@ -204,6 +205,16 @@ class TestPBVI(unittest.TestCase):
         calculatedResult=targetCode.furthestB(successors, B)
         self.assertDictEqual(calculatedResult, expectedResult)
 
+    @data(([{1: 2, 3: 5}, {1: 4, 3: 9}],[{1: 1, 3: 7}, {1: 5, 3: 8}], {1: 2, 3: 5}),
+          ([{'tiger-left':0.5, 'tiger-right':0.5}, {'tiger-left':0.85, 'tiger-right':0.15}, {'tiger-left':0.15, 'tiger-right':0.85}],
+           [{'tiger-left':0.5, 'tiger-right':0.5}, {'tiger-left':0.15, 'tiger-right':0.85}], {'tiger-left':0.85, 'tiger-right':0.15}))
+    @unpack
+    def testKernelFurthestB(self, successors, B, expectedResult):
+        for backend in kernels.availableBackends():
+            calculatedResult=targetCode.KernelFurthestB(backend)(successors, B)
+            self.assertDictEqual(calculatedResult, targetCode.furthestB(successors, B))
+            self.assertDictEqual(calculatedResult, expectedResult)
+
 
 if __name__ == '__main__':
     unittest.main()
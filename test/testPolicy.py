@@ -0,0 +1,119 @@
+import sys
+sys.path.append('../src/')
+
+import os
+import tempfile
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+import domains
+from batchBeliefTransition import BatchBeliefTransition
+from matrixBackup import MatrixBackup
+from policy import Policy, savePolicy, loadPolicy
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+@ddt
+class TestPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.V=[{'action':'listen', 'alpha':{'tiger-left':0.2, 'tiger-right':0.8}},
+                {'action':'open-left', 'alpha':{'tiger-left':0.6, 'tiger-right':0.8}}]
+        self.policy=Policy(self.V)
+
+    @data(({'tiger-left':0.6, 'tiger-right':0.4}, 'open-left', 0.68),
+          ({'tiger-left':0, 'tiger-right':1}, 'listen', 0.8))
+    @unpack
+    def testSingleBelief(self, b, expectedAction, expectedValue):
+        self.assertEqual(self.policy.action(b), expectedAction)
+        self.assertAlmostEqual(self.policy.value(b), expectedValue)
+
+    @data(([[0.6, 0.4], [0, 1]], ['open-left', 'listen'], [0.68, 0.8]))
+    @unpack
+    def testBatchedBeliefs(self, B, expectedActions, expectedValues):
+        self.assertEqual(self.policy.action(np.array(B)), expectedActions)
+        np.testing.assert_allclose(self.policy.value(np.array(B)), expectedValues)
+
+    def testSolveMatchesCall(self):
+        transitionFunction=TigerTransition()
+        observationFunction=TigerObservation(observationParam)
+        gamma=0.5
+        beliefTransition=targetCode.BeliefTransition(transitionFunction, observationFunction)
+        getBetaAO=targetCode.GetBetaAO(beliefTransition, targetCode.argmaxAlpha)
+        getBetaA=targetCode.GetBetaA(getBetaAO, transitionFunction, TigerReward(rewardParam), observationFunction, stateSpace, observationSpace, gamma, 5)
+        improve=targetCode.Improve(targetCode.Backup(getBetaA, targetCode.argmaxAlpha, stateSpace, actionSpace))
+        expand=targetCode.Expand(beliefTransition, actionSpace, observationSpace, targetCode.furthestB)
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        pbvi=targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), V, 2)
+        b0={'tiger-left':0.5, 'tiger-right':0.5}
+        policy=pbvi.solve(b0)
+        self.assertEqual(policy.action(b0), pbvi(b0))
+        self.assertEqual(len(policy.B), 4)
+        B=[{'tiger-left':0.05*n, 'tiger-right':1-0.05*n} for n in range(21)]
+        self.assertEqual(policy.action(B), [targetCode.argmaxAlpha(policy.V, b)['action'] for b in B])
+
+    def solveTiger(self, V, b0):
+        model=domains.tiger()
+        improve=targetCode.BatchImprove(MatrixBackup(model, 0.9, 8), maxIterations=30)
+        expand=targetCode.IndexedExpand(BatchBeliefTransition(model))
+        pbvi=targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), V, 2)
+        return pbvi.solve(b0)
+
+    def testSolveFromBeliefVector(self):
+        model=domains.tiger()
+        V=[{'action': 'listen', 'alpha': {s: -100/(1-0.9) for s in model.stateSpace}}]
+        expectedPolicy=self.solveTiger(V, {'tiger-left':0.5, 'tiger-right':0.5})
+        calculatedPolicy=self.solveTiger(V, np.array([0.5, 0.5]))
+        self.assertIsInstance(calculatedPolicy.B, np.ndarray)
+        np.testing.assert_allclose(calculatedPolicy.B, model.beliefMatrix(expectedPolicy.B))
+        np.testing.assert_allclose(calculatedPolicy.value(calculatedPolicy.B), expectedPolicy.value(expectedPolicy.B))
+
+    @data(True, False)
+    def testSaveLoadRoundTrip(self, mmap):
+        policy=Policy(self.V, [{'tiger-left':0.5, 'tiger-right':0.5}], metadata={'iterations': 3})
+        path=os.path.join(tempfile.mkdtemp(), 'tiger.policy')
+        savePolicy(policy, path, {'gamma': 0.9})
+        loadedPolicy=loadPolicy(path, mmap)
+        self.assertEqual(loadedPolicy.stateSpace, policy.stateSpace)
+        self.assertEqual(loadedPolicy.actionSpace, policy.actionSpace)
+        self.assertEqual(loadedPolicy.metadata, {'iterations': 3, 'gamma': 0.9})
+        self.assertEqual(isinstance(loadedPolicy.alphaSet.alphas, np.memmap), mmap)
+        np.testing.assert_array_equal(loadedPolicy.alphaSet.alphas, policy.alphaSet.alphas)
+        np.testing.assert_array_equal(loadedPolicy.alphaSet.actions, policy.alphaSet.actions)
+        np.testing.assert_array_equal(loadedPolicy.B, [[0.5, 0.5]])
+        B=np.array([[0.05*n, 1-0.05*n] for n in range(21)])
+        self.assertEqual(loadedPolicy.action(B), policy.action(B))
+
+    def testTupleLabelsAndEmptyBeliefs(self):
+        V=[{'action': ('move', 1), 'alpha': {(0, 0): 1.0, (0, 1): 2.0}}]
+        path=os.path.join(tempfile.mkdtemp(), 'grid.policy')
+        savePolicy(Policy(V), path)
+        loadedPolicy=loadPolicy(path)
+        self.assertEqual(loadedPolicy.stateSpace, [(0, 0), (0, 1)])
+        self.assertEqual(loadedPolicy.action({(0, 0): 1, (0, 1): 0}), ('move', 1))
+        self.assertIsNone(loadedPolicy.B)
+
+    def testNotAPolicyFile(self):
+        path=os.path.join(tempfile.mkdtemp(), 'junk.policy')
+        with open(path, 'wb') as junkFile:
+            junkFile.write(b'junk'*10)
+        with self.assertRaises(ValueError):
+            loadPolicy(path)
+
+    def testWarmStartFromLoadedPolicy(self):
+        model=domains.tiger()
+        V=[{'action': 'listen', 'alpha': {s: -100/(1-0.9) for s in model.stateSpace}}]
+        b0={'tiger-left':0.5, 'tiger-right':0.5}
+        policy=self.solveTiger(V, b0)
+        path=os.path.join(tempfile.mkdtemp(), 'tiger.policy')
+        savePolicy(policy, path)
+        loadedPolicy=loadPolicy(path)
+        warmPolicy=self.solveTiger(loadedPolicy.alphaSet, b0)
+        B=np.array([[0.05*n, 1-0.05*n] for n in range(21)])
+        self.assertTrue(np.all(warmPolicy.value(B) >= loadedPolicy.value(B)-1e-8))
+        self.assertFalse(loadedPolicy.alphaSet.alphas.flags.writeable)
+
+
+if __name__ == '__main__':
+    unittest.main()
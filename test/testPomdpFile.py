@@ -0,0 +1,184 @@
+import sys
+sys.path.append('../src/')
+
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import domains
+import pomdpFile
+from pomdpFile import PomdpFileParser, loadPOMDP, tokenize
+
+tigerFile="""
+# Tiger problem, tiger.95.POMDP
+discount: 0.95
+values: reward
+states: tiger-left tiger-right
+actions: open-left open-right listen
+observations: tiger-left tiger-right Nothing
+
+T:listen
+identity
+
+T:open-left
+uniform
+
+T:open-right
+uniform
+
+O:listen
+0.85 0.15 0.0
+0.15 0.85 0.0
+
+O:open-left : * : Nothing 1.0
+O:open-right : * : Nothing 1.0
+
+R:listen : * : * : * -1
+R:open-left : tiger-left : * : * -100
+R:open-left : tiger-right : * : * 10
+R:open-right : tiger-left : * : * 10
+R:open-right : tiger-right : * : * -100
+"""
+
+numericFile="""
+discount: 0.9
+values: cost
+states: 3
+actions: 2
+observations: 2
+start include: 0 2
+
+T: * : * : * 0.0
+T: 0 : 0 : 1 1.0
+T: 0 : 1
+0.0 0.0 1.0
+T: 0 : 2 : 2 1.0
+T: 1 : * : 0 1.0
+
+O: * : * : 0 1.0
+O: 1 : 2
+0.25 0.75
+
+R: * : * : * : * 1.0
+R: 1 : 2 : 0 : 1 5.0
+R: 0 : 0 : * : * 2.0
+R: 0 : 0 : 1 : 0 4.0
+"""
+
+matrixFormsFile="""
+discount: 0.9
+values: reward
+states: 3
+actions: 2
+observations: 2
+
+T: 0 : 1 : 2 0.7
+T: 0 uniform
+T: 0 : 1
+0.0 0.5 0.5
+T: 1 identity
+T: 1 : 2 : 2 0.0
+T: 1 : 2 : 0 1.0
+
+O: * uniform
+O: 1 : 0 : 0 0.0
+O: 1 : 0 : 1 1.0
+"""
+
+
+@ddt
+class TestPomdpFile(unittest.TestCase):
+
+    def parse(self, text):
+        parser=PomdpFileParser(tokenize(text.splitlines()))
+        transitionMatrix, observationMatrix, rewardMatrix=parser.parse()
+        return parser, transitionMatrix, observationMatrix, rewardMatrix
+
+    def dense(self, matrices):
+        return np.array([matrix if isinstance(matrix, np.ndarray) else matrix.toarray() for matrix in matrices])
+
+    def testTigerMatchesGenerator(self):
+        path=os.path.join(tempfile.mkdtemp(), 'tiger.pomdp')
+        with open(path, 'w') as pomdpFile:
+            pomdpFile.write(tigerFile)
+        model, discount, b0=loadPOMDP(path)
+        expectedResult=domains.tiger()
+        self.assertEqual(discount, 0.95)
+        self.assertEqual(model.stateSpace, expectedResult.stateSpace)
+        self.assertEqual(model.observationSpace, expectedResult.observationSpace)
+        np.testing.assert_allclose(b0, [0.5, 0.5])
+        np.testing.assert_allclose(model.transitionMatrix, expectedResult.transitionMatrix)
+        np.testing.assert_allclose(model.observationMatrix, expectedResult.observationMatrix)
+        np.testing.assert_allclose(model.rewardMatrix, expectedResult.rewardMatrix)
+
+    def testWildcardsAndOverwrites(self):
+        parser, transitionMatrix, observationMatrix, rewardMatrix=self.parse(numericFile)
+        self.assertEqual(parser.stateSpace, [0, 1, 2])
+        np.testing.assert_allclose(self.dense(transitionMatrix), [[[0, 1, 0], [0, 0, 1], [0, 0, 1]], [[1, 0, 0], [1, 0, 0], [1, 0, 0]]])
+        np.testing.assert_allclose(self.dense(observationMatrix), [[[1, 0], [1, 0], [1, 0]], [[1, 0], [1, 0], [0.25, 0.75]]])
+        # R(1, 2) is never reached by its (s', o) override; R(0, 0) reaches s'=1 and o=0 with probability 1
+        np.testing.assert_allclose(rewardMatrix, -np.array([[4, 1, 1], [1, 1, 1]]))
+        np.testing.assert_allclose(parser.startBelief(), [0.5, 0, 0.5])
+
+    @data(('start: 0.2 0.3 0.5', [0.2, 0.3, 0.5]), ('start: 1', [0, 1, 0]), ('start exclude: 1', [0.5, 0, 0.5]), ('start: uniform', [1/3, 1/3, 1/3]))
+    @unpack
+    def testStartBelief(self, start, expectedResult):
+        parser=self.parse(numericFile.replace('start include: 0 2', start))[0]
+        np.testing.assert_allclose(parser.startBelief(), expectedResult)
+
+    def testUnknownName(self):
+        with self.assertRaises(ValueError):
+            self.parse(tigerFile.replace('R:listen', 'R:jump'))
+
+    @data('T: 0 : 5 : 0 1.0', 'T: 2 : 0 : 0 1.0', 'O: 0 : 0 : 2 1.0', 'R: 0 : 3 : * : * 1.0')
+    def testIndexOutOfRange(self, entry):
+        with self.assertRaises(ValueError):
+            self.parse(numericFile+entry)
+
+    def testStartIndexOutOfRange(self):
+        parser=self.parse(numericFile.replace('start include: 0 2', 'start include: 0 3'))[0]
+        with self.assertRaises(ValueError):
+            parser.startBelief()
+
+    def testWholeMatrixForms(self):
+        parser, transitionMatrix, observationMatrix, rewardMatrix=self.parse(matrixFormsFile)
+        np.testing.assert_allclose(self.dense(transitionMatrix), [[[1/3, 1/3, 1/3], [0, 0.5, 0.5], [1/3, 1/3, 1/3]], [[1, 0, 0], [0, 1, 0], [1, 0, 0]]])
+        np.testing.assert_allclose(self.dense(observationMatrix), [[[0.5, 0.5]]*3, [[0, 1], [0.5, 0.5], [0.5, 0.5]]])
+
+    @unittest.skipIf(pomdpFile.sparse is None, 'sparse storage needs scipy')
+    def testIdentityStaysSparse(self):
+        numberOfStates=4000
+        lines=['discount: 0.95', 'values: reward', 'states: %d' % numberOfStates, 'actions: a b', 'observations: 2',
+               'T: a identity', 'T: b identity', 'O: * : * : 0 1.0', 'R: a : * : * : * 1']
+        tracemalloc.start()
+        parser, transitionMatrix, observationMatrix, rewardMatrix=self.parse('\n'.join(lines))
+        peak=tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peak, 50*2**20)
+        self.assertEqual(transitionMatrix[0].nnz, numberOfStates)
+
+    @unittest.skipIf(pomdpFile.sparse is None, 'sparse storage needs scipy')
+    def testLargeSparseModelLoadsQuickly(self):
+        numberOfStates=5000
+        lines=['discount: 0.95', 'values: reward', 'states: %d' % numberOfStates, 'actions: a b', 'observations: 2']
+        for a in ('a', 'b'):
+            for s in range(numberOfStates):
+                lines.append('T: %s : %d : %d 0.5' % (a, s, (s+1)%numberOfStates))
+                lines.append('T: %s : %d : %d 0.5' % (a, s, (s+7)%numberOfStates))
+        lines+=['O: * : * : 0 0.9', 'O: * : * : 1 0.1', 'R: a : * : * : * 1']
+        path=os.path.join(tempfile.mkdtemp(), 'ring.pomdp')
+        with open(path, 'w') as pomdpFile:
+            pomdpFile.write('\n'.join(lines))
+        start=time.perf_counter()
+        model, discount, b0=loadPOMDP(path)
+        self.assertLess(time.perf_counter()-start, 10)
+        self.assertTrue(model.isSparse)
+        self.assertEqual(model.transitionMatrix[0].nnz, 2*numberOfStates)
+        np.testing.assert_allclose(model.rewardMatrix, [np.ones(numberOfStates), np.zeros(numberOfStates)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import PBVI as targetCode
+from alphaSet import AlphaSet
+from compiledModel import compileModel
+from matrixBackup import MatrixBackup
+from prune import Prune
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+try:
+    import scipy
+except ImportError:
+    scipy=None
+
+
+class SizeRecordingBackup(object):
+
+    def __init__(self, batchBackup):
+        self.batchBackup=batchBackup
+        self.model=batchBackup.model
+        self.sizes=[]
+
+    def __call__(self, V, B):
+        self.sizes.append(len(V))
+        return self.batchBackup(V, B)
+
+
+@ddt
+class TestPrune(unittest.TestCase):
+
+    def setUp(self):
+        # [0, 0.5] and [0.4, 0.4] are pointwise dominated; [0.5, 0.5] is only dominated by the envelope of [1, 0] and [0, 1]
+        self.V=[{'action':'listen', 'alpha':{'tiger-left':1, 'tiger-right':0}},
+                {'action':'listen', 'alpha':{'tiger-left':0, 'tiger-right':0.5}},
+                {'action':'listen', 'alpha':{'tiger-left':0, 'tiger-right':1}},
+                {'action':'listen', 'alpha':{'tiger-left':0.4, 'tiger-right':0.4}},
+                {'action':'listen', 'alpha':{'tiger-left':0.5, 'tiger-right':0.5}}]
+        self.B=[{'tiger-left':1, 'tiger-right':0}, {'tiger-left':0.1, 'tiger-right':0.9}]
+
+    @data(('pointwise', 2, [0, 2, 4]), ('lp', 3, [0, 2]), ('belief', 3, [0, 2]))
+    @unpack
+    def testStrength(self, strength, expectedPruned, expectedKept):
+        if strength == 'lp' and scipy is None:
+            self.skipTest('lp pruning needs scipy')
+        prune=Prune(strength)
+        calculatedResult=prune(self.V, self.B)
+        self.assertEqual(calculatedResult, [self.V[i] for i in expectedKept])
+        self.assertEqual(prune.lastPrunedNumber, expectedPruned)
+
+    def testAlphaSetInput(self):
+        prune=Prune('pointwise')
+        calculatedResult=prune(AlphaSet.fromList(self.V, stateSpace, actionSpace), self.B)
+        self.assertIsInstance(calculatedResult, AlphaSet)
+        self.assertEqual(list(calculatedResult), [self.V[i] for i in [0, 2, 4]])
+        prune(calculatedResult, self.B)
+        self.assertEqual(prune.prunedNumber, 2)
+
+    def testInvalidStrength(self):
+        with self.assertRaises(ValueError):
+            Prune('none')
+
+    def testBatchImproveKeepsValuesOnB(self):
+        gamma=0.5
+        model=compileModel(TigerTransition(), TigerObservation(observationParam), TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        B=[{'tiger-left':0.05*n, 'tiger-right':1-0.05*n} for n in range(0, 21, 4)]
+        prune=Prune('belief')
+        expectedResult=targetCode.BatchImprove(MatrixBackup(model, gamma, 5))(V, B)
+        calculatedResult=targetCode.BatchImprove(MatrixBackup(model, gamma, 5), prune)(V, B)
+        self.assertLessEqual(len(calculatedResult), len(B))
+        self.assertGreaterEqual(prune.prunedNumber, len(expectedResult)-len(calculatedResult))
+        Bmatrix=model.beliefMatrix(B)
+        np.testing.assert_allclose(calculatedResult.values(Bmatrix).max(axis=1), expectedResult.values(Bmatrix).max(axis=1))
+
+    @data(0.9, 0.95)
+    def testSizeStaysBoundedOnEverySweep(self, gamma):
+        model=compileModel(TigerTransition(), TigerObservation(observationParam), TigerReward(rewardParam), stateSpace, actionSpace, observationSpace)
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        B=[{'tiger-left':0.05*n, 'tiger-right':1-0.05*n} for n in range(21)]
+        backup=SizeRecordingBackup(MatrixBackup(model, gamma, 5))
+        V=targetCode.BatchImprove(backup, Prune('belief'))(V, B)
+        self.assertGreater(len(backup.sizes), 1)
+        self.assertLessEqual(max(backup.sizes), len(B))
+        self.assertLessEqual(len(V), len(B))
+
+
+if __name__ == '__main__':
+    unittest.main()
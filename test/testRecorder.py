@@ -0,0 +1,94 @@
+import sys
+sys.path.append('../src/')
+
+import io
+import json
+import unittest
+from ddt import ddt, data
+import domains
+import PBVI as targetCode
+from batchBeliefTransition import BatchBeliefTransition
+from matrixBackup import MatrixBackup
+from prune import Prune
+from recorder import Recorder, JsonLinesSink
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now=0.0
+
+    def __call__(self):
+        self.now+=1.0
+        return self.now
+
+
+@ddt
+class TestRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.b0={'tiger-left':0.5, 'tiger-right':0.5}
+
+    def testFlushResetsCounters(self):
+        records=[]
+        recorder=Recorder(records.append)
+        recorder.count('backups', 3)
+        recorder.addTime('improveTime', 0.5)
+        recorder.counted('argmaxCalls', max)(1, 2)
+        recorder.flush('improve', 0, alphaNumber=2)
+        recorder.flush('expand', 0)
+        self.assertEqual(records, [{'phase': 'improve', 'iteration': 0, 'alphaNumber': 2, 'backups': 3, 'argmaxCalls': 1, 'improveTime': 0.5},
+                                   {'phase': 'expand', 'iteration': 0}])
+
+    @data(2, 3)
+    def testListPipelineRecordsEveryPhase(self, expansionNumber):
+        records=[]
+        recorder=Recorder(records.append, FakeClock())
+        transitionFunction=TigerTransition()
+        observationFunction=TigerObservation(observationParam)
+        gamma=0.5
+        argmaxAlpha=recorder.counted('argmaxCalls', targetCode.argmaxAlpha)
+        beliefTransition=targetCode.BeliefTransition(transitionFunction, observationFunction, recorder)
+        getBetaAO=targetCode.GetBetaAO(beliefTransition, argmaxAlpha)
+        getBetaA=targetCode.GetBetaA(getBetaAO, transitionFunction, TigerReward(rewardParam), observationFunction, stateSpace, observationSpace, gamma, 5)
+        improve=targetCode.Improve(targetCode.Backup(getBetaA, argmaxAlpha, stateSpace, actionSpace, recorder), recorder=recorder)
+        expand=targetCode.Expand(beliefTransition, actionSpace, observationSpace, targetCode.furthestB, recorder)
+        V=[{'action': 'listen', 'alpha':{s: min(rewardParam.values())/(1-gamma) for s in stateSpace}}]
+        pbvi=targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), V, expansionNumber, recorder=recorder)
+        policy=pbvi.solve(self.b0)
+        self.assertEqual([record['phase'] for record in records], ['improve', 'expand']*expansionNumber)
+        for record in records:
+            self.assertEqual(record[record['phase']+'Time'], 1.0)
+            self.assertGreater(record['beliefUpdates'], 0)
+        for record in records[0::2]:
+            self.assertEqual(record['backups'], record['sweeps']*record['beliefNumber'])
+            self.assertGreater(record['argmaxCalls'], record['backups'])
+        for previous, record in zip(records[0::2], records[1::2]):
+            self.assertEqual(record['beliefUpdates'], previous['beliefNumber']*len(actionSpace)*len(observationSpace))
+            self.assertEqual(record['beliefNumber'], previous['beliefNumber']+record['beliefsAdded'])
+        self.assertEqual(records[-1]['beliefNumber'], len(policy.B))
+
+    def testBatchPipelineWritesJsonLines(self):
+        stream=io.StringIO()
+        recorder=Recorder(JsonLinesSink(stream))
+        model=domains.tiger()
+        backup=MatrixBackup(model, 0.9, 6, recorder=recorder)
+        prune=Prune('pointwise')
+        improve=targetCode.BatchImprove(backup, prune, maxIterations=10, recorder=recorder)
+        expand=targetCode.IndexedExpand(BatchBeliefTransition(model), recorder=recorder)
+        V=[{'action': 'listen', 'alpha': {s: -1000 for s in model.stateSpace}}]
+        pbvi=targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), V, 3, recorder=recorder)
+        pbvi.solve(self.b0)
+        records=[json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(records), 6)
+        self.assertEqual(sum([record.get('pruned', 0) for record in records]), prune.prunedNumber)
+        for record in records[0::2]:
+            self.assertEqual(record['backups'], record['sweeps']*record['beliefNumber'])
+            self.assertGreaterEqual(record['improveTime'], record['projectTime']+record['backupTime'])
+        for record in records[1::2]:
+            self.assertEqual(record['beliefUpdates'] % (model.numberOfActions*model.numberOfObservations), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
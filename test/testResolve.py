@@ -0,0 +1,115 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import domains
+import PBVI as targetCode
+from alphaSet import AlphaSet
+from batchBeliefTransition import BatchBeliefTransition
+from matrixBackup import MatrixBackup
+from policy import Policy
+from tigerProblem import TigerTransition, TigerReward, TigerObservation, rewardParam, observationParam, stateSpace, observationSpace, actionSpace
+
+
+class CountingBackup(object):
+
+    def __init__(self, batchBackup):
+        self.batchBackup=batchBackup
+        self.model=batchBackup.model
+        self.gamma=batchBackup.gamma
+        self.callNumber=0
+
+    def __call__(self, V, B):
+        self.callNumber+=1
+        return self.batchBackup(V, B)
+
+
+@ddt
+class TestResolve(unittest.TestCase):
+
+    def setUp(self):
+        self.gamma=0.9
+        self.b0={'tiger-left':0.5, 'tiger-right':0.5}
+
+    def lowerBound(self, model):
+        return [{'action': 'listen', 'alpha': {s: model.rewardMatrix.min()/(1-self.gamma) for s in model.stateSpace}}]
+
+    def pbvi(self, model, expansionNumber=5):
+        backup=CountingBackup(MatrixBackup(model, self.gamma, 4))
+        improve=targetCode.BatchImprove(backup)
+        expand=targetCode.IndexedExpand(BatchBeliefTransition(model))
+        return targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), self.lowerBound(model), expansionNumber), backup
+
+    def fixedPoint(self, model, B):
+        backup=MatrixBackup(model, self.gamma, 4)
+        V=AlphaSet.fromList(self.lowerBound(model), model.stateSpace, model.actionSpace)
+        for i in range(500):
+            V=backup(V, B)
+        return Policy(V).value(B)
+
+    def testUnchangedModelNeedsNoShift(self):
+        model=domains.tiger()
+        policy=self.pbvi(model)[0].solve(self.b0)
+        pbvi, backup=self.pbvi(model)
+        resolvedPolicy=pbvi.resolve(policy)
+        self.assertEqual(resolvedPolicy.metadata['shift'], 0)
+        self.assertLessEqual(backup.callNumber, 2)
+        np.testing.assert_allclose(resolvedPolicy.value(policy.B), policy.value(policy.B))
+
+    @data(({'obs_correct_prob':0.84, 'obs_incorrect_prob':0.16}, None),
+          ({'obs_correct_prob':0.75, 'obs_incorrect_prob':0.25}, None),
+          (None, {'listen_cost':-2, 'open_incorrect_cost':-100, 'open_correct_reward':10}))
+    @unpack
+    def testWarmStartIsCheaperLowerBound(self, newObservationParam, newRewardParam):
+        policy=self.pbvi(domains.tiger())[0].solve(self.b0)
+        newModel=domains.tiger(newRewardParam, newObservationParam)
+        coldPbvi, coldBackup=self.pbvi(newModel, 0)
+        coldPbvi.V=coldPbvi.improve(coldPbvi.V, policy.B)
+        warmPbvi, warmBackup=self.pbvi(newModel)
+        resolvedPolicy=warmPbvi.resolve(policy)
+        self.assertLess(warmBackup.callNumber, coldBackup.callNumber)
+        self.assertTrue(np.all(resolvedPolicy.value(policy.B) <= self.fixedPoint(newModel, newModel.beliefMatrix(policy.B))+1e-3))
+        self.assertTrue(np.all(resolvedPolicy.value(policy.B) >= Policy(coldPbvi.V).value(policy.B)-1e-3))
+
+    def testListPipeline(self):
+        transitionFunction=TigerTransition()
+        observationFunction=TigerObservation(observationParam)
+        gamma=0.5
+        beliefTransition=targetCode.BeliefTransition(transitionFunction, observationFunction)
+
+        def pbvi(rewardFunction):
+            getBetaAO=targetCode.GetBetaAO(beliefTransition, targetCode.argmaxAlpha)
+            getBetaA=targetCode.GetBetaA(getBetaAO, transitionFunction, rewardFunction, observationFunction, stateSpace, observationSpace, gamma, 5)
+            improve=targetCode.Improve(targetCode.Backup(getBetaA, targetCode.argmaxAlpha, stateSpace, actionSpace))
+            expand=targetCode.Expand(beliefTransition, actionSpace, observationSpace, targetCode.furthestB)
+            V=[{'action': 'listen', 'alpha':{s: -200 for s in stateSpace}}]
+            return targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), V, 2)
+
+        policy=pbvi(TigerReward(rewardParam)).solve(self.b0)
+        newRewardParam=dict(rewardParam, listen_cost=-2)
+        resolvedPolicy=pbvi(TigerReward(newRewardParam)).resolve(policy)
+        coldPbvi=pbvi(TigerReward(newRewardParam))
+        coldV=coldPbvi.improve(coldPbvi.V, policy.B)
+        self.assertIsInstance(resolvedPolicy.V, list)
+        self.assertGreater(resolvedPolicy.metadata['shift'], 0)
+        self.assertTrue(np.all(resolvedPolicy.value(policy.B) >= Policy(coldV).value(policy.B)-1e-3))
+
+    def testMissingBeliefsRaise(self):
+        model=domains.tiger()
+        policy=self.pbvi(model)[0].solve(self.b0)
+        with self.assertRaises(ValueError):
+            self.pbvi(model)[0].resolve(Policy(policy.V))
+
+    def testUndiscountedModelRaises(self):
+        model=domains.tiger()
+        policy=self.pbvi(model)[0].solve(self.b0)
+        improve=targetCode.BatchImprove(MatrixBackup(model, 1.0, 4))
+        pbvi=targetCode.PBVI(improve, targetCode.IndexedExpand(BatchBeliefTransition(model)), targetCode.GetPolicy(targetCode.argmaxAlpha), self.lowerBound(model), 0)
+        with self.assertRaises(ValueError):
+            pbvi.resolve(policy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+sys.path.append('../src/')
+
+import unittest
+from ddt import ddt, data, unpack
+import numpy as np
+import domains
+import PBVI as targetCode
+from batchBeliefTransition import BatchBeliefTransition
+from budget import Budget
+from expansion import GapExpand
+from matrixBackup import MatrixBackup
+from upperBound import UpperBound, qmdpValues, fibValues, sawtooth
+
+
+@ddt
+class TestUpperBound(unittest.TestCase):
+
+    def setUp(self):
+        self.model=domains.tiger()
+        self.gamma=0.9
+        self.batchBeliefTransition=BatchBeliefTransition(self.model)
+        self.grid=np.array([[0.05*n, 1-0.05*n] for n in range(21)])
+        self.b0=np.array([0.5, 0.5])
+
+    def solve(self, expansionNumber, upperBound=None, gapTolerance=None, expand=None):
+        improve=targetCode.BatchImprove(MatrixBackup(self.model, self.gamma, 8), maxIterations=50)
+        expand=targetCode.IndexedExpand(self.batchBeliefTransition) if expand is None else expand
+        V=[{'action': 'listen', 'alpha': {s: self.model.rewardMatrix.min()/(1-self.gamma) for s in self.model.stateSpace}}]
+        pbvi=targetCode.PBVI(improve, expand, targetCode.GetPolicy(targetCode.argmaxAlpha), V, expansionNumber, upperBound=upperBound, gapTolerance=gapTolerance)
+        return pbvi.solve(self.model.belief(self.b0))
+
+    @data(([0.5, 0.5], 0.0), ([0.75, 0.25], 0.5), ([1, 0], 1.0), ([0.25, 0.75], 0.5))
+    @unpack
+    def testSawtoothInterpolation(self, b, expectedResult):
+        calculatedResult=sawtooth(np.array([b]), np.array([1.0, 1.0]), np.array([[0.5, 0.5]]), np.array([0.0]))
+        self.assertAlmostEqual(calculatedResult[0], expectedResult)
+
+    def testFibIsTighterThanQmdp(self):
+        qmdp=qmdpValues(self.model, self.gamma)
+        fib=fibValues(self.model, self.gamma)
+        self.assertTrue(np.all(fib <= qmdp+1e-9))
+        self.assertLess(fib.min(), qmdp.min())
+
+    @data('fib', 'qmdp')
+    def testBoundsEnclosePolicyValue(self, initialization):
+        policy=self.solve(6)
+        upperBound=UpperBound(self.batchBeliefTransition, self.gamma, initialization)
+        before=upperBound.value(self.grid)
+        for i in range(5):
+            upperBound.update(policy.B)
+            upperBound.update(self.grid)
+        after=upperBound.value(self.grid)
+        self.assertTrue(np.all(after <= before+1e-9))
+        self.assertLess(after.sum(), before.sum())
+        self.assertTrue(np.all(upperBound.gap(policy.V, self.grid) >= -1e-6))
+
+    def testUpdateReachesFixedPoint(self):
+        upperBound=UpperBound(self.batchBeliefTransition, self.gamma)
+        self.assertGreater(upperBound.update(self.grid), len(self.grid))
+        self.assertEqual(upperBound.update(self.grid), 0)
+
+    def testUpdateStopsAtSweepCap(self):
+        upperBound=UpperBound(self.batchBeliefTransition, self.gamma, maxSweeps=1)
+        self.assertLessEqual(upperBound.update(self.grid), len(self.grid))
+        self.assertGreater(upperBound.update(self.grid), 0)
+
+    def testUpdateStopsWhenBudgetIsExhausted(self):
+        upperBound=UpperBound(self.batchBeliefTransition, self.gamma)
+        before=upperBound.value(self.grid)
+        self.assertEqual(upperBound.update(self.grid, Budget(timeLimit=0)), 0)
+        self.assertTrue(np.array_equal(upperBound.value(self.grid), before))
+
+    def testGapShrinksAndStopsSolve(self):
+        gaps=[self.solve(expansionNumber, UpperBound(self.batchBeliefTransition, self.gamma)).metadata['gap'] for expansionNumber in (1, 3, 6)]
+        self.assertTrue(gaps[0] > gaps[1] > gaps[2] >= 0)
+        policy=self.solve(None, UpperBound(self.batchBeliefTransition, self.gamma), gapTolerance=gaps[1])
+        self.assertEqual(policy.metadata['stopReason'], 'gap')
+        self.assertLess(policy.metadata['gap'], gaps[1])
+
+    @data(None, 1, 2)
+    def testGapExpandBudget(self, budget):
+        upperBound=UpperBound(self.batchBeliefTransition, self.gamma)
+        expand=GapExpand(self.batchBeliefTransition, upperBound, budget)
+        policy=self.solve(2, upperBound, expand=expand)
+        BNew=expand(policy.B, policy.V)
+        self.assertEqual(BNew[:len(policy.B)], policy.B)
+        self.assertLessEqual(len(BNew)-len(policy.B), len(policy.B) if budget is None else budget)
+        self.assertGreater(len(BNew), len(policy.B))
+        with self.assertRaises(ValueError):
+            expand(policy.B)
+
+
+if __name__ == '__main__':
+    unittest.main()
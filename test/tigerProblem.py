@@ -0,0 +1,66 @@
+class TigerTransition():
+    def __init__(self):
+        self.transitionMatrix = {
+            ('listen', 'tiger-left', 'tiger-left'): 1.0,
+            ('listen', 'tiger-left', 'tiger-right'): 0.0,
+            ('listen', 'tiger-right', 'tiger-left'): 0.0,
+            ('listen', 'tiger-right', 'tiger-right'): 1.0,
+
+            ('open-left', 'tiger-left', 'tiger-left'): 0.5,
+            ('open-left', 'tiger-left', 'tiger-right'): 0.5,
+            ('open-left', 'tiger-right', 'tiger-left'): 0.5,
+            ('open-left', 'tiger-right', 'tiger-right'): 0.5,
+
+            ('open-right', 'tiger-left', 'tiger-left'): 0.5,
+            ('open-right', 'tiger-left', 'tiger-right'): 0.5,
+            ('open-right', 'tiger-right', 'tiger-left'): 0.5,
+            ('open-right', 'tiger-right', 'tiger-right'): 0.5
+        }
+
+    def __call__(self, state, action, nextState):
+        nextStateProb = self.transitionMatrix.get((action, state, nextState), 0.0)
+        return nextStateProb
+
+
+class TigerReward():
+    def __init__(self, rewardParam):
+        self.rewardMatrix = {
+            ('listen', 'tiger-left'): rewardParam['listen_cost'],
+            ('listen', 'tiger-right'): rewardParam['listen_cost'],
+
+            ('open-left', 'tiger-left'): rewardParam['open_incorrect_cost'],
+            ('open-left', 'tiger-right'): rewardParam['open_correct_reward'],
+
+            ('open-right', 'tiger-left'): rewardParam['open_correct_reward'],
+            ('open-right', 'tiger-right'): rewardParam['open_incorrect_cost']
+        }
+
+    def __call__(self, state, action, sPrime):
+        rewardFixed = self.rewardMatrix.get((action, state), 0.0)
+        return rewardFixed
+
+
+class TigerObservation():
+    def __init__(self, observationParam):
+        self.observationMatrix = {
+            ('listen', 'tiger-left', 'tiger-left'): observationParam['obs_correct_prob'],
+            ('listen', 'tiger-left', 'tiger-right'): observationParam['obs_incorrect_prob'],
+            ('listen', 'tiger-right', 'tiger-left'): observationParam['obs_incorrect_prob'],
+            ('listen', 'tiger-right', 'tiger-right'): observationParam['obs_correct_prob'],
+
+            ('open-left', 'tiger-left', 'Nothing'): 1,
+            ('open-left', 'tiger-right', 'Nothing'): 1,
+            ('open-right', 'tiger-left', 'Nothing'): 1,
+            ('open-right', 'tiger-right', 'Nothing'): 1,
+        }
+
+    def __call__(self, state, action, observation):
+        observationProb = self.observationMatrix.get((action, state, observation), 0.0)
+        return observationProb
+
+
+rewardParam={'listen_cost':-1, 'open_incorrect_cost':-100, 'open_correct_reward':10}
+observationParam={'obs_correct_prob':0.85, 'obs_incorrect_prob':0.15}
+stateSpace=['tiger-left', 'tiger-right']
+observationSpace=['tiger-left', 'tiger-right', 'Nothing']
+actionSpace=['open-left', 'open-right', 'listen']